@@ -0,0 +1,245 @@
+"""
+ASGI Adapter
+Serves the Flask app under an ASGI server (see asgi.py at the project root)
+
+- Requests whose endpoint has an async view (routes/async_routes.py) run
+  on the event loop inside a normal Flask request context, so request
+  hooks (metrics, compression, CORS, Server-Timing), JWT error handlers
+  and jsonify behave exactly as in the WSGI app
+- Every other request (writes, uploads, streams, PDF) runs the unchanged
+  WSGI app on a bounded thread pool
+- URLs come from the Flask url_map: blueprints are the single source of
+  the URL layout in both modes
+"""
+
+import asyncio
+import contextvars
+import logging
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.wrappers import Request
+
+from app.extensions.async_db import async_db
+
+
+# Request bodies above this size are spooled to a temporary file
+BODY_SPOOL_BYTES = 1024 * 1024
+
+_END = object()
+
+
+
+
+# ASGI scope -> WSGI environ
+
+async def _read_body(receive):
+    body = tempfile.SpooledTemporaryFile(max_size=BODY_SPOOL_BYTES)
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body.write(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    body.seek(0)
+    return body
+
+
+def build_environ(scope, body):
+    """
+    PEP 3333 environ for an ASGI HTTP scope
+    """
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        # The body is fully buffered: readable to EOF even without Content-Length
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False
+    }
+
+    for name, value in scope.get("headers", ()):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = f"HTTP_{name}"
+        # Repeated headers are joined as in a single comma-separated header
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+
+    return environ
+
+
+def _response_start(status, headers):
+    return {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+    }
+
+
+
+# Application
+
+class AsgiApp:
+    """
+    ASGI callable dispatching between async views and the WSGI app
+    """
+
+    def __init__(self, flask_app, async_views, threads):
+        self.flask_app = flask_app
+        self.async_views = async_views
+        # Threads for the WSGI fallback (and nothing else)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+
+        if scope["type"] != "http":
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        environ = build_environ(scope, await _read_body(receive))
+
+        view = self._match(environ)
+        if view is not None:
+            return await self._call_async_view(view, environ, send)
+
+        await self._call_wsgi(environ, send)
+
+    def _match(self, environ):
+        """
+        Async view for the request, or None when the WSGI app serves it
+        """
+        adapter = self.flask_app.url_map.bind_to_environ(environ)
+        try:
+            endpoint, _ = adapter.match()
+        except HTTPException:
+            return None
+
+        view, wsgi_variant = self.async_views.get(endpoint, (None, None))
+        # Decided up front: hooks, JWT checks and queries run once per request
+        if view is not None and wsgi_variant is not None and wsgi_variant(Request(environ)):
+            return None
+        return view
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await async_db.dispose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # Async views (event loop)
+
+    async def _call_async_view(self, view, environ, send):
+        app = self.flask_app
+        ctx = app.request_context(environ)
+        ctx.push()
+        error = None
+
+        try:
+            # Same steps as Flask.full_dispatch_request, with an awaited view
+            try:
+                try:
+                    rv = app.preprocess_request()
+                    if rv is None:
+                        rv = await view(**ctx.request.view_args)
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+
+                response = app.finalize_request(rv)
+
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+
+            # Buffered here so the body is built inside the request context
+            body = b"" if environ["REQUEST_METHOD"] == "HEAD" else b"".join(response.iter_encoded())
+            status, headers = response.status_code, response.headers.to_wsgi_list()
+            response.close()
+
+        finally:
+            await async_db.remove()
+            ctx.pop(error)
+
+        await send(_response_start(status, headers))
+        await send({"type": "http.response.body", "body": body})
+
+    # WSGI fallback (thread pool)
+
+    async def _call_wsgi(self, environ, send):
+        loop = asyncio.get_running_loop()
+        # One context for the whole request: generators wrapped in
+        # stream_with_context keep their Flask context between chunks
+        context = contextvars.copy_context()
+        started = {}
+
+        def run(fn, *args):
+            return loop.run_in_executor(self.executor, context.run, fn, *args)
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and started.get("sent"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = headers
+            return lambda data: None
+
+        async def send_start():
+            if not started.get("sent"):
+                started["sent"] = True
+                await send(_response_start(started["status"], started["headers"]))
+
+        app_iter = await run(self.flask_app, environ, start_response)
+        try:
+            chunks = iter(app_iter)
+            while True:
+                chunk = await run(next, chunks, _END)
+                if chunk is _END:
+                    break
+                if chunk:
+                    await send_start()
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        except Exception as e:
+            logging.error(f"Error while streaming WSGI response: {e}")
+            raise
+        finally:
+            close = getattr(app_iter, "close", None)
+            if close is not None:
+                await run(close)
+
+        await send_start()
+        await send({"type": "http.response.body", "body": b""})
+
+
+def create_asgi_app(flask_app):
+    """
+    Wrap a Flask app created by create_app(): adds the async engine and
+    dispatches routes with an async view to it
+    """
+    # Imported here so that importing this module never pulls in the controllers
+    from app.routes.async_routes import ASYNC_VIEWS
+
+    async_db.init_app(flask_app)
+    return AsgiApp(flask_app, ASYNC_VIEWS, flask_app.config["ASGI_WSGI_THREADS"])
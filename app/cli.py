@@ -0,0 +1,203 @@
+"""
+CLI Commands
+Registered on the app in create_app
+Usage: flask --app run <command>
+"""
+
+import json
+import os
+import sys
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.extensions.db import db
+from app.extensions.revocation import prune_revoked_tokens
+from app.models.user_model import User
+from app.services.import_service import IMPORT_FORMATS, iter_records, import_expense_records
+from app.services.password_service import hash_password
+from app.services.summary_service import rebuild_category_totals, verify_category_totals
+
+
+def register_commands(app):
+    """
+    Attach project CLI commands to the Flask app
+    """
+    app.cli.add_command(db_init_command)
+    app.cli.add_command(import_expenses_command)
+    app.cli.add_command(summary_group)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(prune_revoked_tokens_command)
+
+
+
+# Schema (replaces create_all at boot when DB_AUTO_CREATE=false)
+
+@click.command("db-init")
+@with_appcontext
+def db_init_command():
+    """
+    Create missing tables and indexes on the primary (existing tables are
+    left untouched; replicas get the schema through replication)
+    """
+    db.create_all(bind_key=None)
+    click.echo("Database tables created")
+
+
+
+# Expired logout (revocation) entries, e.g. from a daily cron job
+
+@click.command("prune-revoked-tokens")
+@with_appcontext
+def prune_revoked_tokens_command():
+    """
+    Delete revoked_tokens rows whose token has expired
+    """
+    deleted = prune_revoked_tokens()
+    click.echo(f"Deleted {deleted} expired revoked token(s)")
+
+
+
+# Import expenses from a CSV / NDJSON file
+
+@click.command("import-expenses")
+@click.argument("path", type=click.Path(dir_okay=False, allow_dash=True))
+@click.option("--user-id", required=True, type=int, help="Owner of the imported expenses")
+@click.option("--format", "file_format", type=click.Choice(IMPORT_FORMATS),
+              help="File format (default: from the file extension, csv for stdin)")
+@click.option("--chunk-size", type=int, help="Rows inserted and committed per chunk")
+@click.option("--offset", default=0, type=int, help="Resume from this record index")
+@with_appcontext
+def import_expenses_command(path, user_id, file_format, chunk_size, offset):
+    """
+    Stream-import expenses for a user; PATH may be "-" for stdin
+    """
+
+    if db.session.get(User, user_id) is None:
+        raise click.ClickException(f"User {user_id} not found")
+
+    if not file_format:
+        extension = os.path.splitext(path)[1].lower()
+        file_format = "ndjson" if extension in (".ndjson", ".jsonl") else "csv"
+
+    chunk_size = chunk_size or current_app.config["IMPORT_CHUNK_SIZE"]
+
+    def progress(stats):
+        click.echo(
+            f"committed_offset={stats['committed_offset']} "
+            f"imported={stats['imported']} rejected={stats['rejected']}",
+            err=True
+        )
+
+    if path == "-":
+        text_stream = sys.stdin
+    else:
+        text_stream = open(path, "r", encoding="utf-8-sig", newline="")
+
+    with text_stream:
+        records = iter_records(text_stream, file_format)
+        stats = import_expense_records(user_id, records, chunk_size, offset=offset, progress=progress)
+
+    click.echo(json.dumps(stats, indent=2))
+
+    if "error" in stats:
+        sys.exit(1)
+
+
+
+# Maintained category totals: rebuild / verify
+
+@click.group("summary")
+def summary_group():
+    """
+    Maintain the expense_category_totals summary table
+    """
+
+
+@summary_group.command("rebuild")
+@click.option("--user-id", type=int, help="Only rebuild this user (default: everyone)")
+@with_appcontext
+def summary_rebuild_command(user_id):
+    """
+    Recompute category totals from the expenses table
+    """
+    rebuild_category_totals(user_id)
+    db.session.commit()
+    click.echo("Category totals rebuilt")
+
+
+@summary_group.command("verify")
+@click.option("--user-id", type=int, help="Only verify this user (default: everyone)")
+@click.option("--fix", is_flag=True, help="Rebuild users whose totals drifted")
+@with_appcontext
+def summary_verify_command(user_id, fix):
+    """
+    Report (and optionally repair) drift between totals and expenses
+    """
+    drift = verify_category_totals(user_id)
+
+    for entry in drift:
+        click.echo(json.dumps(entry))
+
+    if not drift:
+        click.echo("Category totals are consistent")
+        return
+
+    if fix:
+        for drifted_user in sorted({entry["user_id"] for entry in drift}):
+            rebuild_category_totals(drifted_user)
+        db.session.commit()
+        click.echo(f"Rebuilt totals for {len({entry['user_id'] for entry in drift})} user(s)")
+        return
+
+    sys.exit(1)
+
+
+
+# Synthetic data for load / scale testing
+
+@click.command("seed")
+@click.option("--users", default=1000, type=int, help="Users to create")
+@click.option("--expenses", default=1_000_000, type=int, help="Expenses to create in total")
+@click.option("--batch-size", default=10000, type=int, help="Rows per INSERT batch")
+@click.option("--workers", default=min(os.cpu_count() or 1, 8), type=int, help="Generator / loader processes")
+@click.option("--days", default=730, type=int, help="Spread expense dates over this many days up to today")
+@click.option("--seed", "random_seed", default=1, type=int, help="Random seed (same seed, same data)")
+@click.option("--email-prefix", default="seed", help="Users are <prefix><n>@example.com")
+@click.option("--password", default="Seed@123", help="Password of every seeded user")
+@click.option("--skip-summary", is_flag=True, help="Do not rebuild category totals afterwards")
+@with_appcontext
+def seed_command(users, expenses, batch_size, workers, days, random_seed, email_prefix, password, skip_summary):
+    """
+    Generate users and realistic expenses with parallel batched inserts
+    """
+    # Only this command needs the generator / multiprocessing machinery
+    from app.services.seed_service import create_seed_users, seed_email_filter, seed_expenses
+
+    if users < 1 or expenses < 0 or batch_size < 1 or workers < 1 or days < 1:
+        raise click.ClickException("users, batch-size, workers and days must be positive")
+
+    exists = db.session.query(User.user_id).filter(seed_email_filter(User.email, email_prefix)).first()
+    if exists:
+        raise click.ClickException(f"Users with prefix '{email_prefix}' already exist; pass another --email-prefix")
+
+    user_ids = create_seed_users(db.session, users, email_prefix, hash_password(password))
+    click.echo(f"Created {len(user_ids)} users", err=True)
+
+    def progress(rows, elapsed):
+        click.echo(f"rows={rows} rows_per_second={rows / elapsed:.0f}", err=True)
+
+    # Pooled connections must not be shared with the worker processes
+    db.engine.dispose()
+    stats = seed_expenses(
+        current_app.config["SQLALCHEMY_DATABASE_URI"], user_ids, expenses,
+        batch_size, workers, random_seed, days, progress=progress
+    )
+
+    if not skip_summary:
+        rebuild_category_totals()
+        db.session.commit()
+
+    stats["users"] = len(user_ids)
+    click.echo(json.dumps(stats, indent=2))
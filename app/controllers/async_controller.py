@@ -0,0 +1,131 @@
+"""
+Async Controller
+Event-loop versions of the I/O-bound read endpoints (ASGI mode only)
+
+Each view mirrors its WSGI counterpart in expense_controller /
+user_controller and shares its query building, pagination and
+serialization; only the database round trips are awaited
+"""
+
+import logging
+from flask import g, request, jsonify
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions.async_db import async_db
+from app.models.expense_model import Expense
+from app.utils.jwt_helper import async_jwt_user_required, get_current_user_id
+from app.utils.http_cache import async_conditional_on_data_version
+from app.utils.serializers import expense_row_serializer, serialize_user
+from app.services.expense_query_service import (
+    parse_expense_fields,
+    parse_expense_sort,
+    expense_columns,
+    apply_expense_filters,
+    apply_expense_sort
+)
+from app.services.summary_service import get_category_summary_async
+from app.services.user_cache import get_user_by_id_async
+from app.controllers.expense_controller import expense_page_query, expense_page
+
+
+
+# Get Expenses of Logged-in User (see expense_controller.get_expenses)
+
+@async_jwt_user_required
+@async_conditional_on_data_version
+async def get_expenses():
+    """
+    Paginated / ?all=true listing; streaming variants are routed to the
+    WSGI view (see routes/async_routes.py)
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        sort = parse_expense_sort(request.args.get("sort"))
+        fields = parse_expense_fields(request.args.get("fields"))
+        serialize = expense_row_serializer(fields)
+
+        query = select(*expense_columns(fields, sort)).where(Expense.user_id == user_id)
+        query = apply_expense_sort(apply_expense_filters(query, request.args), sort)
+        query, limit = expense_page_query(query, sort)
+
+        rows = (await async_db.session.execute(query)).all()
+        return jsonify(expense_page(rows, serialize, sort, limit)), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    except SQLAlchemyError as e:
+        logging.error(f"Database error while fetching expenses: {e}")
+        return jsonify({"message": "Database error"}), 500
+
+    except Exception as e:
+        logging.error(f"Unexpected error while fetching expenses: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
+# Category-wise Expense Summary (see expense_controller.expense_summary_by_category)
+
+@async_jwt_user_required
+@async_conditional_on_data_version
+async def expense_summary_by_category():
+    """
+    Total expense amount per category
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        summary = await get_category_summary_async(user_id)
+
+        result = [
+            {"category": row.category, "total_amount": float(row.total)}
+            for row in summary
+        ]
+
+        return jsonify({
+            "message": "Expense summary generated successfully",
+            "summary": result
+        }), 200
+
+    except SQLAlchemyError as e:
+        logging.error(f"Database error while generating summary: {e}")
+        return jsonify({"message": "Database error"}), 500
+
+    except Exception as e:
+        logging.error(f"Unexpected error while generating summary: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
+# Get Logged-in User Profile (see user_controller.get_user_profile)
+
+@async_jwt_user_required
+@async_conditional_on_data_version
+async def get_user_profile():
+    """
+    Fetch the profile details of the currently logged-in user
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        user = await get_user_by_id_async(user_id, g.data_version)
+        if not user:
+            return jsonify({"message": "User not found"}), 404
+
+        return jsonify({
+            "message": "User profile fetched successfully",
+            "user": serialize_user(user)
+        }), 200
+
+    except SQLAlchemyError as e:
+        logging.error(f"Database error while fetching user profile: {e}")
+        return jsonify({"message": "Database error"}), 500
+
+    except Exception as e:
+        logging.error(f"Unexpected error while fetching user profile: {e}")
+        return jsonify({"message": "Internal server error"}), 500
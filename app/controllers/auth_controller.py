@@ -10,8 +10,15 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from app.extensions.db import db
-from app.extensions.bcrypt import bcrypt
 from app.models.user_model import User
+from app.services.password_service import (
+    PasswordHasherBusy,
+    hash_password,
+    check_password,
+    needs_rehash,
+    busy_headers
+)
+from app.services.user_cache import invalidate_user, load_user_by_id, load_user_by_email
 from app.utils.jwt_helper import (
     create_tokens_for_user,
     create_access_token_for_refresh,
@@ -47,8 +54,8 @@ def signup():
         if existing_user:
             return jsonify({"message": "User already exists"}), 409
 
-        # Hash password using bcrypt
-        hashed_password = bcrypt.generate_password_hash(password).decode("utf-8")
+        # Hash password using bcrypt (worker pool)
+        hashed_password = hash_password(password)
 
         # Create user object
         user = User(
@@ -69,6 +76,9 @@ def signup():
             }
         }), 201
 
+    except PasswordHasherBusy:
+        return jsonify({"message": "Server busy, please retry"}), 503, busy_headers()
+
     except IntegrityError:
         db.session.rollback()
         return jsonify({"message": "User already exists"}), 409
@@ -101,15 +111,19 @@ def login():
         if not email or not password:
             return jsonify({"message": "Email and password are required"}), 400
 
-        # Fetch user
-        user = User.query.filter_by(email=email).first()
+        # Fetch user (per-worker cache, checked against the credential stamp)
+        user = load_user_by_email(email)
         if not user:
             return jsonify({"message": "Invalid email or password"}), 401
 
         # Verify password
-        if not bcrypt.check_password_hash(user.password_hash, password):
+        if not check_password(user.password_hash, password):
             return jsonify({"message": "Invalid email or password"}), 401
 
+        # Transparently upgrade hashes made with a different bcrypt cost
+        if needs_rehash(user.password_hash):
+            _rehash_password(user.user_id, password)
+
         # Create JWT tokens
         tokens = create_tokens_for_user(user)
 
@@ -125,6 +139,9 @@ def login():
             }
         }), 200
 
+    except PasswordHasherBusy:
+        return jsonify({"message": "Server busy, please retry"}), 503, busy_headers()
+
     except SQLAlchemyError as e:
         logging.error(f"Database error during login: {e}")
         return jsonify({"message": "Database error"}), 500
@@ -135,6 +152,25 @@ def login():
 
 
 
+def _rehash_password(user_id, password):
+    """
+    Store a hash at the current cost; failures never block the login
+    """
+    try:
+        user = User.query.get(user_id)
+        if not user:
+            return
+        user.password_hash = hash_password(password)
+        db.session.commit()
+        invalidate_user(user_id)
+    except PasswordHasherBusy:
+        pass
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Database error while rehashing password: {e}")
+
+
+
 # Refresh Access Token
 
 @jwt_required(refresh=True)
@@ -148,8 +184,8 @@ def refresh_token():
         if not user_id:
             return jsonify({"message": "Invalid refresh token"}), 401
 
-        # Fetch user
-        user = User.query.get(user_id)
+        # Fetch user (cached; deleted accounts can no longer refresh)
+        user = load_user_by_id(user_id)
         if not user:
             return jsonify({"message": "User not found"}), 404
 
@@ -182,12 +218,22 @@ def logout():
     try:
         revoked = revoke_current_token()
         if not revoked:
+            db.session.rollback()
             return jsonify({"message": "Failed to revoke token"}), 500
 
+        # The SQL revocation backend only stages its row
+        db.session.commit()
+
         return jsonify({
             "message": "Logout successful"
         }), 200
 
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Database error during logout: {e}")
+        return jsonify({"message": "Database error"}), 500
+
     except Exception as e:
+        db.session.rollback()
         logging.error(f"Unexpected error during logout: {e}")
         return jsonify({"message": "Internal server error"}), 500
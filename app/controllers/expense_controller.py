@@ -4,14 +4,48 @@ Handles expense CRUD operations and summary reports
 All APIs are JWT protected and user-based
 """
 
+import io
 import logging
-from flask import request, jsonify, send_file
+from datetime import date, timedelta
+from flask import g, request, jsonify, send_file, current_app, url_for, Response, stream_with_context
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.extensions.db import db
 from app.models.expense_model import Expense
 from app.utils.jwt_helper import jwt_user_required, get_current_user_id
+from app.utils.pagination import parse_limit, parse_offset
+from app.utils.validators import validate_expense
+from app.utils.http_cache import etag_matches, not_modified, conditional_on_data_version
+from app.utils.read_routing import replica_reads
+from app.utils.serializers import (
+    REPORT_COLUMNS,
+    expense_row_serializer,
+    serialize_expense,
+    serialize_report_row
+)
+from app.services.expense_query_service import (
+    parse_expense_sort,
+    apply_expense_filters,
+    apply_expense_sort,
+    apply_expense_cursor,
+    expense_cursor,
+    expense_filter_key,
+    parse_expense_fields,
+    expense_columns
+)
+from app.services.expense_service import insert_expenses, record_expense_changes
+from app.services.import_service import iter_records, import_expense_records
+from app.services.export_service import iter_ndjson, iter_json_array, iter_csv
+from app.services.summary_service import get_category_summary
+from app.services.rollup_service import GRANULARITIES, get_rollups
 from app.services.report_service import generate_pdf_report
+from app.services.report_cache import report_cache_key, cached_report_path, store_report
+from app.services.report_jobs import (
+    ReportQueueFull,
+    submit_report_job,
+    get_report_job,
+    report_job_file
+)
 
 
 
@@ -27,39 +61,19 @@ def create_expense():
         user_id = get_current_user_id()
         data = request.get_json() or {}
 
-        required_fields = ["expense_date", "category", "amount"]
-        if not all(data.get(field) for field in required_fields):
-            return jsonify({"message": "Required fields are missing"}), 400
-
-        expense = Expense(
-            user_id=user_id,
-            expense_date=data.get("expense_date"),
-            category=data.get("category"),
-            amount=data.get("amount"),
-            description=data.get("description"),
-            payment_mode=data.get("payment_mode"),
-            merchant_name=data.get("merchant_name"),
-            location=data.get("location"),
-            notes=data.get("notes")
-        )
+        values, error = validate_expense(data)
+        if error:
+            return jsonify({"message": error}), 400
+
+        expense = Expense(user_id=user_id, **values)
 
         db.session.add(expense)
+        record_expense_changes(user_id, added=[(expense.category, expense.amount, expense.expense_date)])
         db.session.commit()
 
         return jsonify({
             "message": "Expense created successfully",
-            "expense": {
-                "expense_id": expense.expense_id,
-                "expense_date": expense.expense_date,
-                "category": expense.category,
-                "amount": float(expense.amount),
-                "description": expense.description,
-                "payment_mode": expense.payment_mode,
-                "merchant_name": expense.merchant_name,
-                "location": expense.location,
-                "notes": expense.notes,
-                "created_at": expense.created_at
-            }
+            "expense": serialize_expense(expense)
         }), 201
 
     except SQLAlchemyError as e:
@@ -73,38 +87,187 @@ def create_expense():
 
 
 
-# Get All Expenses of Logged-in User
+# Create Many Expenses in One Request
 
 @jwt_user_required
-def get_expenses():
+def create_expenses_bulk():
     """
-    Fetch all expenses of the logged-in user
+    Create up to BULK_EXPENSE_MAX_ITEMS expenses in a single transaction
+
+    Body: {"expenses": [...]} or a bare JSON array
+    Query params:
+    - return_ids=false: skip fetching generated ids (fastest path on MySQL)
+
+    All items are validated first; if any item is invalid nothing is inserted
     """
 
     try:
         user_id = get_current_user_id()
+        data = request.get_json(silent=True)
+
+        items = data.get("expenses") if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            return jsonify({"message": "A non-empty list of expenses is required"}), 400
+
+        max_items = current_app.config["BULK_EXPENSE_MAX_ITEMS"]
+        if len(items) > max_items:
+            return jsonify({"message": f"At most {max_items} expenses per request"}), 413
+
+        rows = []
+        errors = []
+        for index, item in enumerate(items):
+            values, error = validate_expense(item)
+            if error:
+                errors.append({"index": index, "message": error})
+            else:
+                values["user_id"] = user_id
+                rows.append(values)
+
+        if errors:
+            return jsonify({"message": "Validation failed", "errors": errors}), 400
+
+        return_ids = request.args.get("return_ids", "").lower() != "false"
+        expense_ids = insert_expenses(rows, return_ids=return_ids)
+        record_expense_changes(user_id, added=[
+            (row["category"], row["amount"], row["expense_date"]) for row in rows
+        ])
+        db.session.commit()
 
-        expenses = Expense.query.filter_by(user_id=user_id).all()
-
-        result = []
-        for exp in expenses:
-            result.append({
-                "expense_id": exp.expense_id,
-                "expense_date": exp.expense_date,
-                "category": exp.category,
-                "amount": float(exp.amount),
-                "description": exp.description,
-                "payment_mode": exp.payment_mode,
-                "merchant_name": exp.merchant_name,
-                "location": exp.location,
-                "notes": exp.notes,
-                "created_at": exp.created_at
-            })
+        results = [
+            {"index": index, "expense_id": expense_ids[index] if return_ids else None}
+            for index in range(len(rows))
+        ]
 
         return jsonify({
-            "message": "Expenses fetched successfully",
-            "expenses": result
-        }), 200
+            "message": "Expenses created successfully",
+            "created": len(rows),
+            "results": results
+        }), 201
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Database error while creating expenses in bulk: {e}")
+        return jsonify({"message": "Database error"}), 500
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Unexpected error while creating expenses in bulk: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
+# Import Expenses from a CSV / NDJSON Upload
+
+@jwt_user_required
+def import_expenses_upload():
+    """
+    Stream-import expenses from the request body or a multipart "file" field
+
+    Query params:
+    - format: csv or ndjson (defaults from the Content-Type)
+    - chunk_size: rows inserted and committed per chunk
+    - offset: resume from this record index (committed_offset of a previous run)
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        upload = request.files.get("file")
+        stream = upload.stream if upload else request.stream
+        mimetype = upload.mimetype if upload else request.mimetype
+
+        file_format = request.args.get("format") or (
+            "ndjson" if mimetype in ("application/x-ndjson", "application/jsonl") else "csv"
+        )
+
+        chunk_size = parse_limit(
+            request.args.get("chunk_size"),
+            current_app.config["IMPORT_CHUNK_SIZE"],
+            current_app.config["IMPORT_MAX_CHUNK_SIZE"],
+            name="chunk_size"
+        )
+        offset = parse_offset(request.args.get("offset"))
+
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        records = iter_records(text_stream, file_format)
+
+        stats = import_expense_records(user_id, records, chunk_size, offset=offset)
+
+        if stats.get("error_type") == "database":
+            return jsonify({"message": "Import stopped on a database error", "import": stats}), 500
+
+        if "error" in stats:
+            # Earlier chunks stay committed; resume from committed_offset
+            return jsonify({"message": "Import stopped on an invalid file", "import": stats}), 400
+
+        return jsonify({"message": "Expenses imported successfully", "import": stats}), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Unexpected error during expense import: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
+# Get Expenses of Logged-in User (filtered, sorted, keyset paginated)
+
+@jwt_user_required
+@conditional_on_data_version
+@replica_reads
+def get_expenses():
+    """
+    Fetch expenses of the logged-in user
+
+    Query params:
+    - date_from, date_to, category (multi-value), payment_mode,
+      merchant_name, min_amount, max_amount: filters
+    - sort: expense_date or amount, prefix with "-" for descending
+      (default -expense_date)
+    - limit: page size (default EXPENSE_PAGE_LIMIT, capped at EXPENSE_PAGE_MAX_LIMIT)
+    - cursor: next_cursor from the previous page
+    - all=true: return every matching expense in one response (unpaginated)
+    - fields: comma-separated response keys (only those columns are selected)
+
+    Streaming (every matching expense, constant memory):
+    - Accept: application/x-ndjson -> one expense per line
+    - stream=true -> the usual JSON body, written incrementally
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        sort = parse_expense_sort(request.args.get("sort"))
+        fields = parse_expense_fields(request.args.get("fields"))
+        serialize = expense_row_serializer(fields)
+
+        # Plain column tuples of just the requested fields (+ cursor keys)
+        query = db.session.query(*expense_columns(fields, sort)).filter(Expense.user_id == user_id)
+        query = apply_expense_sort(apply_expense_filters(query, request.args), sort)
+
+        # Streaming modes read rows in server-side cursor batches
+        batch_size = current_app.config["EXPENSE_STREAM_BATCH_SIZE"]
+
+        if wants_ndjson(request):
+            return Response(
+                stream_with_context(iter_ndjson(query, serialize, batch_size)),
+                mimetype="application/x-ndjson"
+            )
+
+        if streams_expense_list(request):
+            envelope = {"message": "Expenses fetched successfully"}
+            return Response(
+                stream_with_context(iter_json_array(query, serialize, batch_size, envelope)),
+                mimetype="application/json"
+            )
+
+        query, limit = expense_page_query(query, sort)
+        return jsonify(expense_page(query.all(), serialize, sort, limit)), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
     except SQLAlchemyError as e:
         logging.error(f"Database error while fetching expenses: {e}")
@@ -115,6 +278,63 @@ def get_expenses():
         return jsonify({"message": "Internal server error"}), 500
 
 
+def expense_page_query(query, sort):
+    """
+    Limit the listing query to one page (+1 row to detect a next page)
+
+    Returns (query, limit); limit is None for the explicit ?all=true listing
+    """
+    if request.args.get("all", "").lower() == "true":
+        return query, None
+
+    limit = parse_limit(
+        request.args.get("limit"),
+        current_app.config["EXPENSE_PAGE_LIMIT"],
+        current_app.config["EXPENSE_PAGE_MAX_LIMIT"]
+    )
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        # Seek past the last row instead of OFFSET scanning
+        query = apply_expense_cursor(query, sort, cursor)
+
+    return query.limit(limit + 1), limit
+
+
+def expense_page(rows, serialize, sort, limit):
+    """
+    Response body of a listing page (next_cursor only when paginated)
+    """
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = expense_cursor(sort, rows[-1])
+
+    response = {
+        "message": "Expenses fetched successfully",
+        "expenses": [serialize(row) for row in rows]
+    }
+    if limit is not None:
+        response["next_cursor"] = next_cursor
+    return response
+
+
+def wants_ndjson(req):
+    """
+    Client explicitly prefers NDJSON over JSON
+    """
+    best = req.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+    return best == "application/x-ndjson"
+
+
+def streams_expense_list(req):
+    """
+    Listing requested as a stream (NDJSON or stream=true); takes any
+    werkzeug request, so the ASGI dispatcher can check it before routing
+    """
+    return wants_ndjson(req) or req.args.get("stream", "").lower() == "true"
+
+
 
 # Update an Existing Expense
 
@@ -132,30 +352,32 @@ def update_expense(expense_id):
         if not expense:
             return jsonify({"message": "Expense not found"}), 404
 
-        # Update allowed fields
-        for field in [
+        # Update allowed fields, validating the merged result
+        fields = [
             "expense_date", "category", "amount", "description",
             "payment_mode", "merchant_name", "location", "notes"
-        ]:
-            if field in data:
-                setattr(expense, field, data[field])
+        ]
+        merged = {field: getattr(expense, field) for field in fields}
+        merged.update({field: data[field] for field in fields if field in data})
 
+        values, error = validate_expense(merged)
+        if error:
+            return jsonify({"message": error}), 400
+
+        previous = (expense.category, expense.amount, expense.expense_date)
+        for field, value in values.items():
+            setattr(expense, field, value)
+
+        record_expense_changes(
+            user_id,
+            added=[(expense.category, expense.amount, expense.expense_date)],
+            removed=[previous]
+        )
         db.session.commit()
 
         return jsonify({
             "message": "Expense updated successfully",
-            "expense": {
-                "expense_id": expense.expense_id,
-                "expense_date": expense.expense_date,
-                "category": expense.category,
-                "amount": float(expense.amount),
-                "description": expense.description,
-                "payment_mode": expense.payment_mode,
-                "merchant_name": expense.merchant_name,
-                "location": expense.location,
-                "notes": expense.notes,
-                "created_at": expense.created_at
-            }
+            "expense": serialize_expense(expense)
         }), 200
 
     except SQLAlchemyError as e:
@@ -185,6 +407,7 @@ def delete_expense(expense_id):
             return jsonify({"message": "Expense not found"}), 404
 
         db.session.delete(expense)
+        record_expense_changes(user_id, removed=[(expense.category, expense.amount, expense.expense_date)])
         db.session.commit()
 
         return jsonify({
@@ -205,26 +428,22 @@ def delete_expense(expense_id):
 # Category-wise Expense Summary
 
 @jwt_user_required
+@conditional_on_data_version
+@replica_reads
 def expense_summary_by_category():
     """
-    Generate total expense amount grouped by category
+    Total expense amount per category
+
+    Served from the maintained expense_category_totals table
     """
 
     try:
         user_id = get_current_user_id()
 
-        summary = (
-            db.session.query(
-                Expense.category,
-                db.func.sum(Expense.amount).label("total_amount")
-            )
-            .filter(Expense.user_id == user_id)
-            .group_by(Expense.category)
-            .all()
-        )
+        summary = get_category_summary(user_id)
 
         result = [
-            {"category": row.category, "total_amount": float(row.total_amount)}
+            {"category": row.category, "total_amount": float(row.total)}
             for row in summary
         ]
 
@@ -243,36 +462,192 @@ def expense_summary_by_category():
 
 
 
+# Time-bucketed Spending Rollups
+
+@jwt_user_required
+@conditional_on_data_version
+def expense_rollups():
+    """
+    Spending totals per day / week / month / year bucket
+
+    Query params:
+    - granularity: day, week, month or year (default month)
+    - from, to: YYYY-MM-DD (default: the year up to today);
+      every bucket overlapping the range is returned whole
+    - group_by=category: split each bucket by category
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        granularity = request.args.get("granularity", "month")
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+
+        group_by = request.args.get("group_by")
+        if group_by not in (None, "", "category"):
+            raise ValueError("group_by must be category")
+
+        date_to = _parse_query_date("to") or date.today()
+        date_from = _parse_query_date("from") or date_to - timedelta(days=365)
+        if date_from > date_to:
+            raise ValueError("from must not be after to")
+
+        starts, rows = get_rollups(
+            user_id, granularity, date_from, date_to,
+            current_app.config["ROLLUP_MAX_BUCKETS"]
+        )
+        # Newly materialized buckets
+        db.session.commit()
+
+        if group_by:
+            buckets = [
+                {
+                    "bucket_start": start.isoformat(),
+                    "category": category,
+                    "total_amount": float(total),
+                    "count": count
+                }
+                for start, category, total, count in sorted(rows, key=lambda row: (row[0], row[1]))
+            ]
+        else:
+            # Zero-filled series, one entry per bucket
+            totals = {start: [0.0, 0] for start in starts}
+            for start, _, total, count in rows:
+                totals[start][0] += float(total)
+                totals[start][1] += count
+            buckets = [
+                {"bucket_start": start.isoformat(), "total_amount": round(total, 2), "count": count}
+                for start, (total, count) in totals.items()
+            ]
+
+        return jsonify({
+            "message": "Expense rollups generated successfully",
+            "granularity": granularity,
+            "from": starts[0].isoformat(),
+            "to": date_to.isoformat(),
+            "buckets": buckets
+        }), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Database error while generating rollups: {e}")
+        return jsonify({"message": "Database error"}), 500
+
+    except Exception as e:
+        logging.error(f"Unexpected error while generating rollups: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+def _parse_query_date(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
+
+
+# Export Expenses as CSV (streamed)
+
+@jwt_user_required
+@replica_reads
+def export_expenses_csv():
+    """
+    Stream logged-in user's expenses as CSV
+
+    Accepts the same filter, sort and fields params as the expense list
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        sort = parse_expense_sort(request.args.get("sort"))
+        fields = parse_expense_fields(request.args.get("fields"))
+
+        query = db.session.query(*expense_columns(fields)).filter(Expense.user_id == user_id)
+        query = apply_expense_sort(apply_expense_filters(query, request.args), sort)
+
+        header = list(fields)
+        batch_size = current_app.config["EXPENSE_STREAM_BATCH_SIZE"]
+
+        return Response(
+            stream_with_context(iter_csv(query, header, batch_size)),
+            mimetype="text/csv",
+            headers={"Content-Disposition": "attachment; filename=expenses.csv"}
+        )
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    except Exception as e:
+        logging.error(f"Unexpected error during CSV export: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
 # Export Expenses as PDF
+
+def _pdf_report_rows(user_id):
+    """
+    Rows rendered into the PDF report (list filters apply)
+    """
+    sort = parse_expense_sort(request.args.get("sort", "expense_date"))
+
+    query = db.session.query(*REPORT_COLUMNS).filter(Expense.user_id == user_id)
+    query = apply_expense_sort(apply_expense_filters(query, request.args), sort)
+
+    return [serialize_report_row(row) for row in query]
+
+
 @jwt_user_required
+@replica_reads
 def export_expenses_pdf():
     """
     Export logged-in user's expenses as PDF
+
+    Rendered reports are cached per (user, filters, data version);
+    the cache key doubles as a strong ETag for If-None-Match
     """
 
     try:
         user_id = get_current_user_id()
 
-        expenses = Expense.query.filter_by(user_id=user_id).all()
+        # Version read on the primary before the rows (replica_reads), so a
+        # cached report is never older than its key
+        etag = report_cache_key(user_id, expense_filter_key(request.args), g.data_version)
 
-        if not expenses:
-            return jsonify({"message": "No expenses found"}), 404
+        if etag_matches(etag):
+            return not_modified(etag)
 
-        expense_data = [{
-            "expense_date": e.expense_date,
-            "category": e.category,
-            "amount": float(e.amount),
-            "payment_mode": e.payment_mode
-        } for e in expenses]
+        pdf_path = cached_report_path(etag)
 
-        pdf_file = generate_pdf_report(expense_data)
+        if pdf_path is None:
+            expense_data = _pdf_report_rows(user_id)
 
-        return send_file(
-            pdf_file,
+            if not expense_data:
+                return jsonify({"message": "No expenses found"}), 404
+
+            pdf_path = store_report(etag, generate_pdf_report(expense_data))
+
+        response = send_file(
+            pdf_path,
             download_name="expenses_report.pdf",
             as_attachment=True,
-            mimetype="application/pdf"
+            mimetype="application/pdf",
+            etag=etag,
+            conditional=False
         )
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
     except SQLAlchemyError as e:
         logging.error(f"Database error during PDF export: {e}")
@@ -280,4 +655,99 @@ def export_expenses_pdf():
 
     except Exception as e:
         logging.error(f"Unexpected error during PDF export: {e}")
-        return jsonify({"message": "Internal server error"}), 500
\ No newline at end of file
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
+# Asynchronous PDF Report Jobs
+
+@jwt_user_required
+@replica_reads
+def create_report_job():
+    """
+    Queue a PDF report render in the report process pool
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        expense_data = _pdf_report_rows(user_id)
+
+        if not expense_data:
+            return jsonify({"message": "No expenses found"}), 404
+
+        job = submit_report_job(user_id, expense_data)
+        job["status_url"] = url_for("expense.get_report_job_status", job_id=job["job_id"])
+
+        return jsonify({
+            "message": "Report job created",
+            "job": job
+        }), 202, {"Location": job["status_url"]}
+
+    except ReportQueueFull:
+        return jsonify({"message": "Report queue is full, try again later"}), 503, {
+            "Retry-After": str(current_app.config["REPORT_RETRY_AFTER_SECONDS"])
+        }
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    except SQLAlchemyError as e:
+        logging.error(f"Database error while creating report job: {e}")
+        return jsonify({"message": "Database error"}), 500
+
+    except Exception as e:
+        logging.error(f"Unexpected error while creating report job: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+@jwt_user_required
+def get_report_job_status(job_id):
+    """
+    Poll the status of a report job
+    """
+
+    try:
+        job = get_report_job(get_current_user_id(), job_id)
+        if not job:
+            return jsonify({"message": "Report job not found"}), 404
+
+        if job["status"] == "done":
+            job["download_url"] = url_for("expense.download_report_job", job_id=job_id)
+
+        return jsonify({
+            "message": "Report job fetched successfully",
+            "job": job
+        }), 200
+
+    except Exception as e:
+        logging.error(f"Unexpected error while fetching report job: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+@jwt_user_required
+def download_report_job(job_id):
+    """
+    Download the finished PDF of a report job
+    """
+
+    try:
+        user_id = get_current_user_id()
+
+        path = report_job_file(user_id, job_id)
+        if not path:
+            job = get_report_job(user_id, job_id)
+            if not job:
+                return jsonify({"message": "Report job not found"}), 404
+            return jsonify({"message": f"Report job is {job['status']}"}), 409
+
+        return send_file(
+            path,
+            download_name="expenses_report.pdf",
+            as_attachment=True,
+            mimetype="application/pdf"
+        )
+
+    except Exception as e:
+        logging.error(f"Unexpected error while downloading report job: {e}")
+        return jsonify({"message": "Internal server error"}), 500
@@ -2,8 +2,9 @@ import logging, random
 from flask import request, jsonify
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions.db import db
-from app.extensions.bcrypt import bcrypt
 from app.models.user_model import User
+from app.services.user_cache import invalidate_user
+from app.services.password_service import PasswordHasherBusy, hash_password, busy_headers
 from app.utils.validators import valid_email, valid_password
 
 # In-memory OTP store (for demo)
@@ -104,14 +105,17 @@ def reset_password():
         if not user:
             return jsonify({"message": "User not found"}), 404
 
-        hashed_pw = bcrypt.generate_password_hash(new_password).decode("utf-8")
+        hashed_pw = hash_password(new_password)
         user.password_hash = hashed_pw
         db.session.commit()
+        invalidate_user(user.user_id)
 
         del reset_codes[email]
 
         return jsonify({"message": "Password reset successful. Please login."}), 200
 
+    except PasswordHasherBusy:
+        return jsonify({"message": "Server busy, please retry"}), 503, busy_headers()
     except SQLAlchemyError as e:
         db.session.rollback()
         logging.error(f"DB error in reset_password: {e}")
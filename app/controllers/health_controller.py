@@ -0,0 +1,76 @@
+"""
+Health Controller
+Operational status of background workers and shared resources
+"""
+
+import logging
+from flask import jsonify
+
+from app.extensions.db import db
+from app.extensions.revocation import revocation_store
+from app.services.report_jobs import report_queue_stats
+from app.services.user_cache import user_cache_stats
+from app.utils.db_pool import pool_status
+
+
+
+# PDF Report Queue Depth
+
+def report_queue_health():
+    """
+    Report pool size and current queue depth of this web worker
+    """
+
+    try:
+        return jsonify({
+            "message": "Report queue status fetched successfully",
+            "reports": report_queue_stats()
+        }), 200
+
+    except Exception as e:
+        logging.error(f"Unexpected error while fetching report queue status: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
+# Per-worker Cache Hit Rates
+
+def cache_health():
+    """
+    Hit-rate statistics of this web worker's user and token revocation caches
+    """
+
+    try:
+        return jsonify({
+            "message": "Cache status fetched successfully",
+            "users": user_cache_stats(),
+            "revocation": revocation_store.store.stats()
+        }), 200
+
+    except Exception as e:
+        logging.error(f"Unexpected error while fetching cache status: {e}")
+        return jsonify({"message": "Internal server error"}), 500
+
+
+
+# Database Connection Pools
+
+def db_pool_health():
+    """
+    In-use / idle / overflow connections and checkout timings per engine
+    """
+
+    try:
+        pools = {
+            bind_key or "default": pool_status(engine)
+            for bind_key, engine in db.engines.items()
+        }
+
+        return jsonify({
+            "message": "Database pool status fetched successfully",
+            "pools": pools
+        }), 200
+
+    except Exception as e:
+        logging.error(f"Unexpected error while fetching database pool status: {e}")
+        return jsonify({"message": "Internal server error"}), 500
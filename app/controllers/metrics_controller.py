@@ -0,0 +1,26 @@
+"""
+Metrics Controller
+Request metrics in the Prometheus text exposition format
+"""
+
+import logging
+from flask import Response, jsonify
+
+from app.extensions.metrics import request_metrics
+
+
+
+# Prometheus Scrape Endpoint
+
+def prometheus_metrics():
+    """
+    Request count, error count and latency histogram per endpoint
+    (all worker processes when METRICS_MULTIPROC_DIR is set)
+    """
+
+    try:
+        return Response(request_metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    except Exception as e:
+        logging.error(f"Unexpected error while rendering metrics: {e}")
+        return jsonify({"message": "Internal server error"}), 500
@@ -5,17 +5,25 @@ All actions are JWT protected and user-id based
 """
 
 import logging
-from flask import jsonify, request
+from flask import g, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions.db import db
 from app.models.user_model import User
 from app.utils.jwt_helper import jwt_user_required, get_current_user_id
+from app.utils.http_cache import conditional_on_data_version
+from app.utils.serializers import serialize_user
+from app.utils.read_routing import replica_reads
+from app.services.data_version_service import bump_data_version
+from app.services.expense_service import delete_user_bookkeeping
+from app.services.user_cache import get_user_by_id, invalidate_user
 
 
 
 # Get Logged-in User Profile
 
 @jwt_user_required
+@conditional_on_data_version
+@replica_reads
 def get_user_profile():
     """
     Fetch the profile details of the currently logged-in user
@@ -24,18 +32,14 @@ def get_user_profile():
     try:
         user_id = get_current_user_id()
 
-        user = User.query.get(user_id)
+        # Cached per data version: the body always matches the ETag
+        user = get_user_by_id(user_id, g.data_version)
         if not user:
             return jsonify({"message": "User not found"}), 404
 
         return jsonify({
             "message": "User profile fetched successfully",
-            "user": {
-                "user_id": user.user_id,
-                "full_name": user.full_name,
-                "email": user.email,
-                "created_at": user.created_at
-            }
+            "user": serialize_user(user)
         }), 200
 
     except SQLAlchemyError as e:
@@ -78,7 +82,9 @@ def update_user_profile():
         if email:
             user.email = email.strip().lower()
 
+        bump_data_version(user_id)
         db.session.commit()
+        invalidate_user(user_id)
 
         return jsonify({
             "message": "User profile updated successfully",
@@ -115,8 +121,12 @@ def delete_user_account():
         if not user:
             return jsonify({"message": "User not found"}), 404
 
+        # New version: profile caches and ETags of the account retire
+        bump_data_version(user_id)
+        delete_user_bookkeeping(user_id)
         db.session.delete(user)
         db.session.commit()
+        invalidate_user(user_id)
 
         return jsonify({
             "message": "User account deleted successfully"
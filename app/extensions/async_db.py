@@ -0,0 +1,102 @@
+"""
+Async DB Extension
+AsyncEngine + per-request AsyncSession for the ASGI serving mode (asgi.py)
+
+- ASYNC_DATABASE_URL defaults to DATABASE_URL with its driver swapped for
+  the asyncio one (pymysql -> aiomysql, sqlite -> aiosqlite, ...)
+- Pool sizing follows the DB_POOL_* settings of the sync engine
+- Requires SQLAlchemy's asyncio extra (greenlet) and the async driver,
+  see requirements-async.txt; the WSGI app never imports them
+"""
+
+from flask import g
+from sqlalchemy.engine import make_url
+
+from app.utils.db_pool import engine_options
+
+
+# Sync driver -> asyncio driver of the same database
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg"
+}
+
+
+def async_database_url(database_uri):
+    """
+    Same database through its asyncio driver (URLs already async are kept)
+    """
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver known for '{backend}'; set ASYNC_DATABASE_URL")
+    if url.get_driver_name() in ASYNC_DRIVERS.values():
+        return url
+
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+class AsyncDatabase:
+    """
+    Flask extension owning the AsyncEngine; sessions are scoped to the
+    request (stored on g, closed by the ASGI app when the request ends)
+    """
+
+    def __init__(self):
+        self.engine = None
+        self._sessionmaker = None
+
+    def init_app(self, app):
+        # Imported here: needs greenlet, which only the async mode installs
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        config = app.config
+        url = config["ASYNC_DATABASE_URL"] or async_database_url(config["SQLALCHEMY_DATABASE_URI"])
+
+        options = engine_options(
+            str(url),
+            pool_size=config["DB_POOL_SIZE"],
+            max_overflow=config["DB_MAX_OVERFLOW"],
+            pool_timeout=config["DB_POOL_TIMEOUT"],
+            pool_recycle=config["DB_POOL_RECYCLE"],
+            pre_ping=config["DB_POOL_PRE_PING"]
+        )
+        # The instrumented pool is a sync QueuePool; asyncio engines pick their own
+        options.pop("poolclass", None)
+
+        self.engine = create_async_engine(url, **options)
+        self._sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        # Same per-request SQL timing / slow-query log as the sync engines
+        profiler = app.extensions.get("sql_profiler")
+        if profiler is not None:
+            profiler.instrument(self.engine.sync_engine)
+
+        app.extensions["async_db"] = self
+
+    @property
+    def session(self):
+        """
+        AsyncSession of the current request (created on first use)
+        """
+        session = g.get("async_db_session")
+        if session is None:
+            session = g.async_db_session = self._sessionmaker()
+        return session
+
+    async def remove(self):
+        """
+        Close the current request's session, returning its connection to the pool
+        """
+        session = g.pop("async_db_session", None)
+        if session is not None:
+            await session.close()
+
+    async def dispose(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+async_db = AsyncDatabase()
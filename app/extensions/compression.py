@@ -0,0 +1,189 @@
+"""
+Compression Extension
+Negotiated response compression (Accept-Encoding): brotli and zstd when
+their libraries are installed, gzip always
+
+- Only text media types listed in COMPRESS_MIMETYPES are compressed
+  (PDFs and other already-compressed files are left alone)
+- Buffered responses smaller than COMPRESS_MIN_SIZE bytes are sent as is
+- Streamed responses are compressed chunk by chunk, each chunk flushed,
+  so nothing is buffered whole
+- Strong ETags get a "-<coding>" suffix per encoding; etag_matches in
+  app.utils.http_cache accepts either form
+"""
+
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+# Content codings an ETag may be suffixed with
+ETAG_CODINGS = ("br", "zstd", "gzip")
+
+
+
+# Per-response compressors (compress a chunk, flush it to the client)
+
+class _GzipCompressor:
+    def __init__(self, level):
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, level):
+        self._brotli = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._brotli.process(data) + self._brotli.flush()
+
+    def finish(self):
+        return self._brotli.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level):
+        self._zstd = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._zstd.compress(data) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def _available_compressors():
+    compressors = {"gzip": _GzipCompressor}
+    if brotli is not None:
+        compressors["br"] = _BrotliCompressor
+    if zstandard is not None:
+        compressors["zstd"] = _ZstdCompressor
+    return compressors
+
+
+
+# Flask extension
+
+class Compress:
+    """
+    after_request hook compressing eligible responses
+    """
+
+    def init_app(self, app):
+        available = _available_compressors()
+
+        # Server preference order, limited to installed codecs
+        self.codings = [
+            coding.strip() for coding in app.config["COMPRESS_ALGORITHMS"].split(",")
+            if coding.strip() in available
+        ]
+        self.compressors = available
+        self.levels = {
+            "gzip": app.config["COMPRESS_LEVEL"],
+            "br": app.config["COMPRESS_BROTLI_LEVEL"],
+            "zstd": app.config["COMPRESS_ZSTD_LEVEL"]
+        }
+        self.min_size = app.config["COMPRESS_MIN_SIZE"]
+        self.mimetypes = set(app.config["COMPRESS_MIMETYPES"])
+
+        app.extensions["compress"] = self
+        app.after_request(self.after_request)
+
+    def negotiate(self):
+        """
+        Best content coding the client accepts (None for identity)
+        """
+        accepted = request.accept_encodings
+        best, best_quality = None, 0
+        for coding in self.codings:
+            quality = accepted[coding]
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def after_request(self, response):
+        if response.status_code == 304:
+            return self._tag_not_modified(response)
+
+        if (
+            response.mimetype not in self.mimetypes
+            or response.status_code < 200
+            or response.status_code == 204
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or "no-transform" in response.headers.get("Cache-Control", "")
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+
+        coding = self.negotiate()
+        if coding is None:
+            return response
+
+        compressor = self.compressors[coding](self.levels[coding])
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, compressor)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(compressor.compress(data) + compressor.finish())
+
+        response.headers["Content-Encoding"] = coding
+        _suffix_etag(response, coding)
+        return response
+
+    def _tag_not_modified(self, response):
+        """
+        Give a 304 the suffixed ETag the client validated with
+        """
+        etag, weak = response.get_etag()
+        coding = self.negotiate()
+        if etag and coding and request.if_none_match.contains(f"{etag}-{coding}"):
+            response.set_etag(f"{etag}-{coding}", weak)
+        return response
+
+
+def _suffix_etag(response, coding):
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{coding}", weak)
+
+
+def _compress_stream(chunks, compressor):
+    """
+    Compress and flush each chunk as it is produced
+    """
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+    finally:
+        # Release the wrapped generator (and its DB cursor) on disconnect
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+compress = Compress()
@@ -2,7 +2,10 @@
 
 from flask_sqlalchemy import SQLAlchemy
 
+from app.extensions.replica_routing import RoutingSession
+
 # Purpose:
 # This db object is a SINGLE database instance
 # Used across models, controllers, services
-db = SQLAlchemy()
+# Reads may be routed to a replica bind (see replica_routing)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
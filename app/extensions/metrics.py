@@ -0,0 +1,333 @@
+"""
+Metrics Extension
+Per-endpoint request count, error count and latency histogram,
+rendered in the Prometheus text exposition format
+
+- Each thread records into its own shard (no locks on the request path);
+  shards are summed when /metrics is scraped
+- With METRICS_MULTIPROC_DIR set, a background thread in every worker
+  process writes its totals to <dir>/metrics-<pid>.json every
+  METRICS_FLUSH_SECONDS (and once more at exit), and a scrape sums all
+  files, so any worker answers for the whole server. Files of exited
+  workers are folded into metrics-archive.json, so counters never go
+  backwards and files do not pile up as workers are recycled
+- Latency is measured up to the end of after_request processing; the
+  body of streamed responses is not included
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+from flask import g, request
+
+
+# Histogram upper bounds, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Requests to these endpoints are not recorded
+EXCLUDED_ENDPOINTS = ("metrics.prometheus_metrics", "static")
+
+# Totals of exited worker processes (multiprocess mode)
+ARCHIVE_FILE = "metrics-archive.json"
+
+# Floor of the flush interval, so METRICS_FLUSH_SECONDS=0 cannot spin
+MIN_FLUSH_SECONDS = 0.05
+
+
+
+# Series storage
+
+def _new_series():
+    # [count, latency sum, per-bucket counts (last = +Inf)]
+    return [0, 0.0, [0] * (len(LATENCY_BUCKETS) + 1)]
+
+
+def labels(**values):
+    """
+    Prometheus label set, values escaped
+    """
+    escaped = []
+    for name, value in values.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _merge(totals, series_items):
+    for key, (count, latency_sum, buckets) in series_items:
+        merged = totals.get(key)
+        if merged is None:
+            merged = totals[key] = _new_series()
+        merged[0] += count
+        merged[1] += latency_sum
+        merged[2] = [a + b for a, b in zip(merged[2], buckets)]
+
+
+def _read_series(path):
+    with open(path) as handle:
+        rows = json.load(handle)["series"]
+    return [(tuple(row[:4]), row[4:]) for row in rows]
+
+
+def _write_series(path, totals):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump({"series": [[*key, *value] for key, value in totals.items()]}, handle)
+    os.replace(tmp_path, path)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    return True
+
+
+class RequestMetrics:
+    """
+    Flask extension recording request metrics in before / after_request hooks
+    """
+
+    def __init__(self):
+        self._reset()
+        # Forked workers start from zero instead of re-counting the parent's
+        # requests (POSIX only; Windows has no fork)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._dirty = False
+
+    def init_app(self, app):
+        self.multiproc_dir = app.config["METRICS_MULTIPROC_DIR"]
+        self.flush_seconds = app.config["METRICS_FLUSH_SECONDS"]
+
+        if self.multiproc_dir:
+            # File locks and pid probes (os.kill(pid, 0) terminates on Windows)
+            if os.name != "posix":
+                raise RuntimeError("METRICS_MULTIPROC_DIR is supported on POSIX platforms only")
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            # Requests recorded since the last periodic flush
+            atexit.register(self._flush_if_dirty)
+
+        app.extensions["metrics"] = self
+        app.before_request(self._start_timer)
+        app.after_request(self._record_response)
+
+    # Request hooks
+
+    def _start_timer(self):
+        g.metrics_start = time.perf_counter()
+
+    def _record_response(self, response):
+        start = g.pop("metrics_start", None)
+        endpoint = request.endpoint
+
+        if start is not None and endpoint not in EXCLUDED_ENDPOINTS:
+            self.record(
+                request.blueprint or "app",
+                endpoint or "unmatched",
+                request.method,
+                response.status_code,
+                time.perf_counter() - start
+            )
+        return response
+
+    # Recording (lock-free per thread)
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, blueprint, endpoint, method, status, seconds):
+        shard = self._shard()
+        key = (blueprint, endpoint, method, str(status))
+
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = _new_series()
+
+        series[0] += 1
+        series[1] += seconds
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[bucket]:
+            bucket += 1
+        series[2][bucket] += 1
+
+        if self.multiproc_dir:
+            self._dirty = True
+            if self._flusher is None:
+                self._start_flusher()
+
+    # Multiprocess files
+
+    def _start_flusher(self):
+        """
+        Periodic flush thread of this process (started on its first request,
+        so every forked worker gets its own)
+        """
+        with self._shards_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(max(self.flush_seconds, MIN_FLUSH_SECONDS))
+            self._flush_if_dirty()
+
+    def _flush_if_dirty(self):
+        if not self._dirty:
+            return
+        with self._flush_lock:
+            self._dirty = False
+            self.flush()
+
+    # Aggregation
+
+    def local_totals(self):
+        """
+        This process's series, summed over thread shards
+        """
+        totals = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            _merge(totals, list(shard.items()))
+        return totals
+
+    def _process_file(self, pid=None):
+        return os.path.join(self.multiproc_dir, f"metrics-{pid or os.getpid()}.json")
+
+    def flush(self):
+        """
+        Write this process's totals for other workers' scrapes
+        """
+        _write_series(self._process_file(), self.local_totals())
+
+    def _retire(self, name):
+        """
+        Fold the file of an exited worker into the archive; the rename
+        claims it, so concurrent scrapes never archive it twice
+        """
+        path = os.path.join(self.multiproc_dir, name)
+        claimed = f"{path}.retired"
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return
+
+        # POSIX only (multiprocess mode is refused elsewhere in init_app)
+        import fcntl
+
+        archive_path = os.path.join(self.multiproc_dir, ARCHIVE_FILE)
+        with open(os.path.join(self.multiproc_dir, "metrics-archive.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive = {}
+            if os.path.exists(archive_path):
+                _merge(archive, _read_series(archive_path))
+            try:
+                _merge(archive, _read_series(claimed))
+            except (OSError, ValueError, KeyError):
+                pass
+            _write_series(archive_path, archive)
+            os.remove(claimed)
+
+    def totals(self):
+        """
+        Totals across every worker process, live or exited (or this one only)
+        """
+        totals = self.local_totals()
+        if not self.multiproc_dir:
+            return totals
+
+        own_file = os.path.basename(self._process_file())
+        names = []
+        for name in os.listdir(self.multiproc_dir):
+            pid = name[len("metrics-"):-len(".json")]
+            if not name.startswith("metrics-") or not name.endswith(".json") or not pid.isdigit():
+                continue
+            if name == own_file:
+                continue
+            if not _process_alive(int(pid)):
+                self._retire(name)
+                continue
+            names.append(name)
+        # Read last: it may have grown by the files retired above
+        names.append(ARCHIVE_FILE)
+
+        for name in names:
+            try:
+                _merge(totals, _read_series(os.path.join(self.multiproc_dir, name)))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        return totals
+
+    # Prometheus text format
+
+    def render(self):
+        totals = self.totals()
+        lines = []
+
+        lines.append("# HELP http_requests_total Requests handled, by endpoint and status")
+        lines.append("# TYPE http_requests_total counter")
+        for (blueprint, endpoint, method, status), (count, _, _) in sorted(totals.items()):
+            lines.append(
+                f"http_requests_total{labels(blueprint=blueprint, endpoint=endpoint, method=method, status=status)} {count}"
+            )
+
+        # Server errors per endpoint (status >= 500)
+        errors = {}
+        for (blueprint, endpoint, method, status), (count, _, _) in totals.items():
+            key = (blueprint, endpoint, method)
+            errors[key] = errors.get(key, 0) + (count if int(status) >= 500 else 0)
+
+        lines.append("# HELP http_request_errors_total Requests answered with a 5xx status")
+        lines.append("# TYPE http_request_errors_total counter")
+        for (blueprint, endpoint, method), count in sorted(errors.items()):
+            lines.append(
+                f"http_request_errors_total{labels(blueprint=blueprint, endpoint=endpoint, method=method)} {count}"
+            )
+
+        # Latency histogram per endpoint (statuses combined)
+        histograms = {}
+        for (blueprint, endpoint, method, _), series in totals.items():
+            _merge(histograms, [((blueprint, endpoint, method), series)])
+
+        lines.append("# HELP http_request_duration_seconds Request latency")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (blueprint, endpoint, method), (count, latency_sum, buckets) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*LATENCY_BUCKETS, "+Inf"), buckets):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else repr(bound)
+                lines.append(
+                    f"http_request_duration_seconds_bucket"
+                    f"{labels(blueprint=blueprint, endpoint=endpoint, method=method, le=le)} {cumulative}"
+                )
+            series_labels = labels(blueprint=blueprint, endpoint=endpoint, method=method)
+            lines.append(f"http_request_duration_seconds_sum{series_labels} {latency_sum:.6f}")
+            lines.append(f"http_request_duration_seconds_count{series_labels} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,143 @@
+"""
+Replica Routing Extension
+Session that sends a request's reads to a read replica once the request
+has been routed to one (see app.utils.read_routing.replica_reads)
+
+- Replicas are the SQLALCHEMY_BINDS whose key starts with "replica_"
+  (built from DATABASE_REPLICA_URLS); they are picked round-robin
+- Anything that writes (ORM flush, INSERT / UPDATE / DELETE) goes to the
+  primary and pins the rest of the request there
+- A replica that fails is skipped for REPLICA_RETRY_SECONDS; database
+  errors raised on a replica are noted on the request (g.replica_error)
+  even when the view catches them, so the request can re-run on the primary
+"""
+
+import itertools
+import threading
+import time
+
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+
+REPLICA_BIND_PREFIX = "replica_"
+
+
+
+# Request-scoped routing state
+
+def use_replica(engine):
+    """
+    Route the current request's reads to a replica engine
+    """
+    g.db_replica = engine
+
+
+def use_primary():
+    """
+    Route the rest of the current request to the primary
+    """
+    g.db_replica = None
+
+
+def _current_replica():
+    if not has_app_context():
+        return None
+    return g.get("db_replica")
+
+
+def _note_replica_error(context):
+    """
+    handle_error listener of the replica engines
+    """
+    if context.engine is not None and context.engine is _current_replica():
+        g.replica_error = context.engine
+
+
+
+# Routing session
+
+class RoutingSession(Session):
+    """
+    Flask-SQLAlchemy session that honours the request's replica routing
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+        replica = _current_replica()
+        if replica is None or bind is not None:
+            return engine
+
+        # Writes always hit the primary, and read-your-writes keeps us there
+        if self._flushing or getattr(clause, "is_dml", False):
+            use_primary()
+            return engine
+
+        # Only statements that would use the default (primary) engine move
+        if engine is self._db.engines.get(None):
+            return replica
+        return engine
+
+
+
+# Replica selection
+
+class ReplicaRouter:
+    """
+    Round-robin over the configured replicas, skipping ones marked down
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._down_until = {}
+        self._counter = itertools.count()
+
+    def init_app(self, app):
+        """
+        Call after db.init_app (the replica engines must exist)
+        """
+        self.retry_seconds = app.config["REPLICA_RETRY_SECONDS"]
+        app.extensions["replica_router"] = self
+
+        with app.app_context():
+            for engine in self.replicas(app.extensions["sqlalchemy"].engines):
+                event.listen(engine, "handle_error", _note_replica_error)
+
+    def replicas(self, engines):
+        return [
+            engine for key, engine in sorted(engines.items(), key=lambda item: item[0] or "")
+            if key and key.startswith(REPLICA_BIND_PREFIX)
+        ]
+
+    def candidates(self, engines):
+        """
+        Healthy replicas, starting at the next one in round-robin order
+        """
+        replicas = self.replicas(engines)
+        if not replicas:
+            return []
+
+        now = time.monotonic()
+        start = next(self._counter) % len(replicas)
+        ordered = replicas[start:] + replicas[:start]
+
+        with self._lock:
+            return [engine for engine in ordered if self._down_until.get(engine, 0) <= now]
+
+    def mark_down(self, engine):
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + self.retry_seconds
+
+    def status(self, engines):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: "down" if self._down_until.get(engine, 0) > now else "up"
+                for key, engine in engines.items()
+                if key and key.startswith(REPLICA_BIND_PREFIX)
+            }
+
+
+replica_router = ReplicaRouter()
@@ -0,0 +1,303 @@
+"""
+Token Revocation Extension
+Shared JWT revocation (logout) store with pluggable backends:
+- memory: per-process dict (single worker / development)
+- sql:    revoked_tokens table, shared by every worker
+- redis:  Redis-protocol server (REDIS_URL), or "local://" for an
+          in-process stand-in used in tests
+
+Entries expire with the token's own exp. Every backend also keeps a
+revocation generation, bumped with each revocation. Lookups go through
+per-process LRUs: "not revoked" answers are kept until the generation
+changes, which each worker checks (one small read, not per token) at
+most every JWT_REVOCATION_CACHE_TTL seconds. So the common path makes
+no network round trip, and revocations made by other workers become
+visible within that interval.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions.db import db
+from app.models.revoked_token_model import RevocationGeneration, RevokedToken
+from app.utils.db_utils import increment_or_insert
+from app.utils.lru_cache import TTLCache
+
+
+
+# Backends
+
+class InMemoryRevocationBackend:
+    """
+    jti -> exp dict, pruned of expired entries as it grows
+    """
+
+    def __init__(self, prune_every: int = 1000):
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self._prune_every = prune_every
+        self._generation = 0
+
+    def generation(self):
+        return self._generation
+
+    def revoke(self, jti, expires_at):
+        with self._lock:
+            self._revoked[jti] = expires_at
+            self._generation += 1
+            if len(self._revoked) % self._prune_every == 0:
+                now = time.time()
+                self._revoked = {k: exp for k, exp in self._revoked.items() if exp > now}
+
+    def is_revoked(self, jti):
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+
+class SQLRevocationBackend:
+    """
+    revoked_tokens table; expired rows are deleted by prune_revoked_tokens()
+    (flask --app run prune-revoked-tokens), never on the request path
+    """
+
+    def generation(self):
+        return db.session.query(RevocationGeneration.generation).filter(
+            RevocationGeneration.id == 1
+        ).scalar() or 0
+
+    def revoke(self, jti, expires_at):
+        """
+        Adds the row (and bumps the generation) in a savepoint of the
+        request's session; the caller commits both at once
+        """
+        expires = datetime.fromtimestamp(expires_at, timezone.utc).replace(tzinfo=None)
+
+        try:
+            with db.session.begin_nested():
+                db.session.add(RevokedToken(jti=jti, expires_at=expires))
+                db.session.flush()
+                increment_or_insert(RevocationGeneration.__table__, {"id": 1}, {"generation": 1})
+        except IntegrityError:
+            # Already revoked (only the savepoint is rolled back)
+            pass
+
+    def is_revoked(self, jti):
+        return db.session.query(
+            RevokedToken.query.filter(
+                RevokedToken.jti == jti,
+                RevokedToken.expires_at > datetime.utcnow()
+            ).exists()
+        ).scalar()
+
+
+class RedisRevocationBackend:
+    """
+    One key per revoked jti, expiring with the token (SET .. EX)
+    """
+
+    KEY_PREFIX = "revoked_jti:"
+    GENERATION_KEY = "revocation_generation"
+
+    def __init__(self, client):
+        self._client = client
+
+    def generation(self):
+        return int(self._client.get(self.GENERATION_KEY) or 0)
+
+    def revoke(self, jti, expires_at):
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            self._client.set(self.KEY_PREFIX + jti, 1, ex=ttl)
+            # After the SET: a worker that sees the new generation also sees the jti
+            self._client.incr(self.GENERATION_KEY)
+
+    def is_revoked(self, jti):
+        return bool(self._client.exists(self.KEY_PREFIX + jti))
+
+
+class LocalRedis:
+    """
+    In-process stand-in for the Redis commands used above (tests / dev)
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None or (entry[1] is not None and entry[1] <= time.time()):
+                return None
+            return entry[0]
+
+    def set(self, name, value, ex=None, nx=False):
+        with self._lock:
+            entry = self._data.get(name)
+            if nx and entry is not None and (entry[1] is None or entry[1] > time.time()):
+                return None
+            self._data[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    def incr(self, name):
+        with self._lock:
+            value, expires_at = self._data.get(name, (0, None))
+            value = int(value) + 1
+            self._data[name] = (value, expires_at)
+            return value
+
+    def exists(self, *names):
+        now = time.time()
+        with self._lock:
+            return sum(
+                1 for name in names
+                if name in self._data and (self._data[name][1] is None or self._data[name][1] > now)
+            )
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+
+
+# Cached store (what the app talks to)
+
+class CachedRevocationStore:
+    """
+    Fronts a backend with per-process caches:
+    - revoked answers are cached long (a revocation is never undone)
+    - "not revoked" answers are kept until the backend's revocation
+      generation changes, checked at most every check_interval seconds
+    """
+
+    # Seconds an unused answer is kept (bounds memory, not correctness)
+    ANSWER_TTL = 3600
+
+    def __init__(self, backend, cache_size: int, check_interval: float):
+        self.backend = backend
+        self.check_interval = check_interval
+        self._revoked = TTLCache(cache_size, ttl=self.ANSWER_TTL)
+        self._not_revoked = TTLCache(cache_size, ttl=self.ANSWER_TTL)
+        self._generation = None
+        self._checked_at = float("-inf")
+        self._generation_checks = 0
+        self._lock = threading.Lock()
+
+    def _sync_generation(self):
+        """
+        Drop cached "not revoked" answers once a revocation was published
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            generation = self.backend.generation()
+            self._generation_checks += 1
+            if generation != self._generation:
+                self._not_revoked.clear()
+                self._generation = generation
+            self._checked_at = now
+
+    def revoke(self, jti, expires_at):
+        self.backend.revoke(jti, expires_at)
+        self._not_revoked.delete(jti)
+        self._revoked.set(jti, True, ttl=max(expires_at - time.time(), 0))
+
+    def is_revoked(self, jti):
+        if self._revoked.get(jti):
+            return True
+
+        # Before the lookup: a revocation committed after it changes the generation
+        self._sync_generation()
+        if self._not_revoked.get(jti):
+            return False
+
+        revoked = self.backend.is_revoked(jti)
+        if revoked:
+            self._revoked.set(jti, True)
+        else:
+            self._not_revoked.set(jti, True)
+        return revoked
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "generation": self._generation,
+            "generation_checks": self._generation_checks,
+            "revoked_cache": self._revoked.stats(),
+            "not_revoked_cache": self._not_revoked.stats()
+        }
+
+
+def prune_revoked_tokens():
+    """
+    Delete expired revoked_tokens rows; returns the number deleted
+    """
+    deleted = RevokedToken.query.filter(RevokedToken.expires_at < datetime.utcnow()).delete()
+    db.session.commit()
+    return deleted
+
+
+def redis_client(url, setting):
+    """
+    Redis client for REDIS_URL ("local://" gives an in-process LocalRedis);
+    setting names the option that asked for it, for the missing-package error
+    """
+    if url.startswith("local://"):
+        return LocalRedis()
+    try:
+        import redis
+    except ImportError:
+        raise RuntimeError(f"{setting}=redis requires the redis package")
+    return redis.Redis.from_url(url)
+
+
+def create_revocation_backend(config):
+    backend = config["JWT_REVOCATION_BACKEND"]
+
+    if backend == "memory":
+        return InMemoryRevocationBackend()
+
+    if backend == "sql":
+        return SQLRevocationBackend()
+
+    if backend == "redis":
+        return RedisRevocationBackend(redis_client(config["REDIS_URL"], "JWT_REVOCATION_BACKEND"))
+
+    raise ValueError(f"Unknown JWT_REVOCATION_BACKEND: {backend}")
+
+
+
+# Flask extension wrapper
+
+class RevocationStore:
+    """
+    Extension object; the configured store lives in app.extensions
+    """
+
+    def init_app(self, app):
+        app.extensions["revocation_store"] = CachedRevocationStore(
+            create_revocation_backend(app.config),
+            cache_size=app.config["JWT_REVOCATION_CACHE_SIZE"],
+            check_interval=app.config["JWT_REVOCATION_CACHE_TTL"]
+        )
+
+    @property
+    def store(self) -> CachedRevocationStore:
+        return current_app.extensions["revocation_store"]
+
+    def revoke(self, jti, expires_at):
+        self.store.revoke(jti, expires_at)
+
+    def is_revoked(self, jti):
+        return self.store.is_revoked(jti)
+
+
+revocation_store = RevocationStore()
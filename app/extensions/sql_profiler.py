@@ -0,0 +1,126 @@
+"""
+SQL Profiler Extension
+Per-request SQL statement count and database time from SQLAlchemy
+cursor events, plus a structured slow-query log
+
+- SQL_SERVER_TIMING=true adds "Server-Timing: db;desc=\"N queries\";dur=ms"
+  (statements run while a streamed body is being sent are not included)
+- Statements slower than SQL_SLOW_QUERY_MS are logged as one JSON object
+  on the "app.slow_query" logger with normalized SQL and the endpoint
+"""
+
+import json
+import logging
+import re
+import time
+from functools import lru_cache
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from app.extensions.db import db
+
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement):
+    """
+    Statement shape for grouping: literals -> ?, IN lists collapsed, one line
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PARAM_LIST.sub("(?, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class SQLProfiler:
+    """
+    Attaches cursor-execute hooks to every engine of the app
+    """
+
+    def init_app(self, app):
+        self.server_timing = app.config["SQL_SERVER_TIMING"]
+        self.slow_query_seconds = app.config["SQL_SLOW_QUERY_MS"] / 1000
+
+        app.extensions["sql_profiler"] = self
+
+        if not self.server_timing and not self.slow_query_seconds:
+            return
+
+        # Call after db.init_app: engines (primary and replicas) exist by now
+        with app.app_context():
+            for engine in db.engines.values():
+                self.instrument(engine)
+
+        if self.server_timing:
+            app.after_request(self._add_server_timing)
+
+    def instrument(self, engine):
+        """
+        Attach the cursor hooks to an engine created outside Flask-SQLAlchemy
+        (e.g. the sync_engine of the async mode's AsyncEngine)
+        """
+        if not self.server_timing and not self.slow_query_seconds:
+            return
+
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    # Cursor hooks
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        in_request = has_request_context()
+        if in_request:
+            g.sql_queries = g.get("sql_queries", 0) + 1
+            g.sql_seconds = g.get("sql_seconds", 0.0) + elapsed
+
+        if self.slow_query_seconds and elapsed >= self.slow_query_seconds:
+            slow_query_logger.warning(json.dumps({
+                "event": "slow_query",
+                "duration_ms": round(elapsed * 1000, 3),
+                "endpoint": request.endpoint if in_request else None,
+                "method": request.method if in_request else None,
+                "path": request.path if in_request else None,
+                "database": conn.engine.url.database,
+                "executemany": executemany,
+                "statement": normalize_sql(statement)
+            }))
+
+    def _handle_error(self, exception_context):
+        # A failed statement never reaches after_cursor_execute: drop its start
+        conn = exception_context.connection
+        if conn is None or conn.invalidated:
+            return
+        starts = conn.info.get("query_start")
+        if starts:
+            starts.pop()
+
+    # Response header
+
+    def _add_server_timing(self, response):
+        queries = g.get("sql_queries", 0)
+        duration_ms = g.get("sql_seconds", 0.0) * 1000
+
+        entry = f'db;desc="{queries} queries";dur={duration_ms:.2f}'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {entry}" if existing else entry
+        return response
+
+
+sql_profiler = SQLProfiler()
@@ -0,0 +1,114 @@
+"""
+User Stamp Extension
+Per-user credential stamps in a store shared by every worker, used to
+validate per-process caches of auth records (login / refresh):
+- memory: per-process dict (single worker / development)
+- redis:  Redis-protocol server (REDIS_URL), or "local://" for an
+          in-process stand-in used in tests
+- sql / none: disabled; the auth path reads users from the database
+  (a stamp check there would cost the same round trip as the read)
+
+A stamp is an opaque random token, replaced after every committed
+profile update, password change and account deletion. A cached record
+is served only while the stamp it was loaded under is still current.
+"""
+
+import threading
+import uuid
+
+from flask import current_app
+
+from app.extensions.revocation import redis_client
+
+
+def _new_stamp():
+    return uuid.uuid4().hex
+
+
+
+# Backends
+
+class InMemoryStampBackend:
+    """
+    user_id -> stamp dict
+    """
+
+    def __init__(self):
+        self._stamps = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        return self._stamps.get(user_id)
+
+    def current(self, user_id):
+        with self._lock:
+            return self._stamps.setdefault(user_id, _new_stamp())
+
+    def bump(self, user_id):
+        with self._lock:
+            self._stamps[user_id] = _new_stamp()
+
+
+class RedisStampBackend:
+    """
+    One key per user; keys expire so idle users do not accumulate
+    (a missing stamp only forces a reload)
+    """
+
+    KEY_PREFIX = "user_stamp:"
+    TTL_SECONDS = 86400
+
+    def __init__(self, client):
+        self._client = client
+
+    def get(self, user_id):
+        stamp = self._client.get(f"{self.KEY_PREFIX}{user_id}")
+        return stamp.decode() if isinstance(stamp, bytes) else stamp
+
+    def current(self, user_id):
+        """
+        The user's stamp, created if missing (SET NX so concurrent
+        loaders agree on one value)
+        """
+        self._client.set(f"{self.KEY_PREFIX}{user_id}", _new_stamp(), ex=self.TTL_SECONDS, nx=True)
+        return self.get(user_id)
+
+    def bump(self, user_id):
+        self._client.set(f"{self.KEY_PREFIX}{user_id}", _new_stamp(), ex=self.TTL_SECONDS)
+
+
+def create_stamp_backend(config):
+    backend = config["USER_STAMP_BACKEND"]
+
+    if backend in ("sql", "none", ""):
+        return None
+
+    if backend == "memory":
+        return InMemoryStampBackend()
+
+    if backend == "redis":
+        return RedisStampBackend(redis_client(config["REDIS_URL"], "USER_STAMP_BACKEND"))
+
+    raise ValueError(f"Unknown USER_STAMP_BACKEND: {backend}")
+
+
+
+# Flask extension wrapper
+
+class UserStamps:
+    """
+    Extension object; the configured backend (or None) lives in app.extensions
+    """
+
+    def init_app(self, app):
+        app.extensions["user_stamps"] = create_stamp_backend(app.config)
+
+    @property
+    def store(self):
+        """
+        The stamp backend, or None when auth reads are not cached
+        """
+        return current_app.extensions["user_stamps"]
+
+
+user_stamps = UserStamps()
@@ -0,0 +1,14 @@
+from app.extensions.db import db
+
+class ExpenseCategoryTotal(db.Model):
+    __tablename__ = "expense_category_totals"
+
+    # Running SUM(amount) / COUNT(*) per user and category,
+    # maintained in the same transaction as every expense write
+    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    category = db.Column(db.String(100), primary_key=True)
+    total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ExpenseCategoryTotal {self.category} - {self.total}>"
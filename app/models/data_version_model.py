@@ -0,0 +1,13 @@
+from app.extensions.db import db
+
+class UserDataVersion(db.Model):
+    __tablename__ = "user_data_versions"
+
+    # Monotonic per-user counter, bumped on every expense / profile write
+    # and on account deletion. No foreign key: the row outlives the user as
+    # a tombstone, so versions (cache keys, ETags) are never handed out twice
+    user_id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<UserDataVersion {self.user_id} - {self.version}>"
@@ -3,6 +3,16 @@ from datetime import datetime
 
 class Expense(db.Model):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Keyset pagination / date range: newest first per user
+        db.Index("ix_expenses_user_date_id", "user_id", "expense_date", "expense_id"),
+        # Equality filters followed by a date range or date sort
+        db.Index("ix_expenses_user_category_date", "user_id", "category", "expense_date"),
+        db.Index("ix_expenses_user_payment_date", "user_id", "payment_mode", "expense_date"),
+        db.Index("ix_expenses_user_merchant_date", "user_id", "merchant_name", "expense_date"),
+        # Amount range filter / amount sort
+        db.Index("ix_expenses_user_amount_id", "user_id", "amount", "expense_id"),
+    )
 
     expense_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
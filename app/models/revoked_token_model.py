@@ -0,0 +1,23 @@
+from app.extensions.db import db
+
+class RevokedToken(db.Model):
+    __tablename__ = "revoked_tokens"
+
+    # Revoked JWT id, kept until the token would have expired anyway
+    jti = db.Column(db.String(64), primary_key=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti}>"
+
+
+class RevocationGeneration(db.Model):
+    __tablename__ = "revocation_generation"
+
+    # Single-row counter bumped with every revocation; workers compare it
+    # to decide whether their cached "not revoked" answers still hold
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RevocationGeneration {self.generation}>"
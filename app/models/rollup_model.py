@@ -0,0 +1,32 @@
+from app.extensions.db import db
+
+class ExpenseRollupBucket(db.Model):
+    __tablename__ = "expense_rollup_buckets"
+
+    # A time bucket whose per-category totals may be materialized.
+    # Every expense write inside it bumps generation; the stored totals
+    # are trusted only while materialized_generation == generation
+    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    granularity = db.Column(db.String(10), primary_key=True)
+    bucket_start = db.Column(db.Date, primary_key=True)
+    bucket_end = db.Column(db.Date, nullable=False)
+    generation = db.Column(db.BigInteger, nullable=False, default=0)
+    materialized_generation = db.Column(db.BigInteger, nullable=True)
+
+    def __repr__(self):
+        return f"<ExpenseRollupBucket {self.granularity} {self.bucket_start}>"
+
+
+class ExpenseRollup(db.Model):
+    __tablename__ = "expense_rollups"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    granularity = db.Column(db.String(10), primary_key=True)
+    bucket_start = db.Column(db.Date, primary_key=True)
+    category = db.Column(db.String(100), primary_key=True)
+    bucket_end = db.Column(db.Date, nullable=False)
+    total = db.Column(db.Numeric(14, 2), nullable=False)
+    count = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<ExpenseRollup {self.granularity} {self.bucket_start} {self.category}>"
@@ -3,6 +3,8 @@ from datetime import datetime
 
 class User(db.Model):
     __tablename__ = "users"
+    # SQLite: never reuse the id of a deleted user (caches and ETags key on it)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     user_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     full_name = db.Column(db.String(100), nullable=False)
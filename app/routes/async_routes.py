@@ -0,0 +1,28 @@
+"""
+Async Routes
+Endpoints served by async views in ASGI mode
+
+Keys are the Flask endpoint names of the blueprint routes, so the URL
+layout stays defined by the blueprints; unlisted endpoints run through
+the WSGI app. Values are (async view, predicate): requests the predicate
+accepts (e.g. streaming variants) are sent to the WSGI view instead,
+before any request hook or view runs
+"""
+
+from app.controllers.async_controller import (
+    get_expenses,
+    expense_summary_by_category,
+    get_user_profile
+)
+from app.controllers.expense_controller import streams_expense_list
+
+ASYNC_VIEWS = {
+    # GET /api/expenses (streamed listings stay on the WSGI view)
+    "expense.get_expenses": (get_expenses, streams_expense_list),
+
+    # GET /api/expenses/summary
+    "expense.expense_summary_by_category": (expense_summary_by_category, None),
+
+    # GET /user/profile
+    "user.get_user_profile": (get_user_profile, None)
+}
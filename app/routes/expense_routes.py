@@ -6,11 +6,18 @@ Defines API endpoints for expense CRUD and reports
 from flask import Blueprint
 from app.controllers.expense_controller import (
     create_expense,
+    create_expenses_bulk,
+    import_expenses_upload,
     get_expenses,
     update_expense,
     delete_expense,
     expense_summary_by_category,
-    export_expenses_pdf
+    expense_rollups,
+    export_expenses_pdf,
+    export_expenses_csv,
+    create_report_job,
+    get_report_job_status,
+    download_report_job
 )
 
 expense_bp = Blueprint("expense", __name__, url_prefix="/api")
@@ -18,7 +25,13 @@ expense_bp = Blueprint("expense", __name__, url_prefix="/api")
 # Create a new expense
 expense_bp.route("/expenses", methods=["POST"])(create_expense)
 
-# Get all expenses of logged-in user
+# Create many expenses in one transaction
+expense_bp.route("/expenses/bulk", methods=["POST"])(create_expenses_bulk)
+
+# Stream-import expenses from a CSV / NDJSON file
+expense_bp.route("/expenses/import", methods=["POST"])(import_expenses_upload)
+
+# Get expenses of logged-in user (cursor paginated, ?all=true for full list)
 expense_bp.route("/expenses", methods=["GET"])(get_expenses)
 
 # Update a specific expense
@@ -30,5 +43,20 @@ expense_bp.route("/expenses/<int:expense_id>", methods=["DELETE"])(delete_expens
 # Get category-wise expense summary
 expense_bp.route("/expenses/summary", methods=["GET"])(expense_summary_by_category)
 
+# Get spending totals per day / week / month / year
+expense_bp.route("/expenses/rollups", methods=["GET"])(expense_rollups)
+
 # Export expenses as PDF
-expense_bp.route("/expenses/export/pdf", methods=["GET"])(export_expenses_pdf)
\ No newline at end of file
+expense_bp.route("/expenses/export/pdf", methods=["GET"])(export_expenses_pdf)
+
+# Export expenses as CSV (streamed, honors list filters)
+expense_bp.route("/expenses/export/csv", methods=["GET"])(export_expenses_csv)
+
+# Queue a PDF report job (rendered off the request path)
+expense_bp.route("/expenses/export/jobs", methods=["POST"])(create_report_job)
+
+# Poll a PDF report job
+expense_bp.route("/expenses/export/jobs/<job_id>", methods=["GET"])(get_report_job_status)
+
+# Download a finished PDF report
+expense_bp.route("/expenses/export/jobs/<job_id>/download", methods=["GET"])(download_report_job)
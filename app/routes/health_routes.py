@@ -0,0 +1,22 @@
+"""
+Health Routes
+Operational status endpoints (internal callers only, see ops_access)
+"""
+
+from flask import Blueprint
+from app.controllers.health_controller import report_queue_health, cache_health, db_pool_health
+from app.utils.ops_access import require_ops_access
+
+health_bp = Blueprint("health", __name__, url_prefix="/health")
+
+# Allowed networks / ops token only
+health_bp.before_request(require_ops_access)
+
+# PDF report pool size and queue depth
+health_bp.route("/reports", methods=["GET"])(report_queue_health)
+
+# User / revocation cache hit rates
+health_bp.route("/cache", methods=["GET"])(cache_health)
+
+# Connection pool usage and checkout timings
+health_bp.route("/db", methods=["GET"])(db_pool_health)
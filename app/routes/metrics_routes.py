@@ -0,0 +1,16 @@
+"""
+Metrics Routes
+Prometheus scrape endpoint (internal callers only, see ops_access)
+"""
+
+from flask import Blueprint
+from app.controllers.metrics_controller import prometheus_metrics
+from app.utils.ops_access import require_ops_access
+
+metrics_bp = Blueprint("metrics", __name__)
+
+# Allowed networks / ops token only (scrapers send the token as a bearer credential)
+metrics_bp.before_request(require_ops_access)
+
+# Request metrics (Prometheus text format)
+metrics_bp.route("/metrics", methods=["GET"])(prometheus_metrics)
@@ -0,0 +1,36 @@
+"""
+Data Version Service
+Per-user monotonic version of a user's data, used for cache keys / ETags
+"""
+
+from sqlalchemy import select
+
+from app.extensions.async_db import async_db
+from app.extensions.db import db
+from app.models.data_version_model import UserDataVersion
+from app.utils.db_utils import increment_or_insert
+
+
+def bump_data_version(user_id):
+    """
+    Increment the user's data version in the caller's transaction
+    """
+    increment_or_insert(UserDataVersion.__table__, {"user_id": int(user_id)}, {"version": 1})
+
+
+def _data_version_query(user_id):
+    return select(UserDataVersion.version).where(UserDataVersion.user_id == int(user_id))
+
+
+def get_data_version(user_id) -> int:
+    """
+    Current data version (0 if the user never wrote anything)
+    """
+    return db.session.execute(_data_version_query(user_id)).scalar() or 0
+
+
+async def get_data_version_async(user_id) -> int:
+    """
+    get_data_version on the async engine (ASGI mode)
+    """
+    return (await async_db.session.execute(_data_version_query(user_id))).scalar() or 0
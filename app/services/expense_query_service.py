@@ -0,0 +1,218 @@
+"""
+Expense Query Service
+Builds filtered, sorted and keyset-paginated expense queries
+from request query parameters
+"""
+
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import and_, or_
+
+from app.models.expense_model import Expense
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serializers import EXPENSE_FIELDS
+
+
+# Sortable keys (non-null columns only, so keyset comparisons stay exact)
+
+SORT_COLUMNS = {
+    "expense_date": Expense.expense_date,
+    "amount": Expense.amount
+}
+
+DEFAULT_SORT = "-expense_date"
+
+# Query params that change which rows (or their order) a listing returns
+FILTER_PARAMS = (
+    "date_from", "date_to", "category", "payment_mode",
+    "merchant_name", "min_amount", "max_amount", "sort"
+)
+
+ExpenseSort = namedtuple("ExpenseSort", ["key", "column", "descending"])
+
+
+
+# Query parameter parsing helpers
+
+def _parse_date(value, name):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
+
+def _parse_amount(value, name):
+    try:
+        amount = Decimal(value)
+    except (TypeError, InvalidOperation):
+        raise ValueError(f"{name} must be a number")
+
+    # Decimal also parses nan / inf, which no SQL comparison handles
+    if not amount.is_finite():
+        raise ValueError(f"{name} must be a number")
+    return amount
+
+
+def _multi_value(args, name):
+    """
+    Accept both ?category=a&category=b and ?category=a,b
+    """
+    values = []
+    for raw in args.getlist(name):
+        values.extend(v.strip() for v in raw.split(",") if v.strip())
+    return values
+
+
+
+# Filters
+
+def apply_expense_filters(query, args):
+    """
+    Push list filters into SQL
+
+    Supported params: date_from, date_to, category (multi-value),
+    payment_mode, merchant_name, min_amount, max_amount
+    """
+
+    if args.get("date_from"):
+        query = query.filter(Expense.expense_date >= _parse_date(args["date_from"], "date_from"))
+
+    if args.get("date_to"):
+        query = query.filter(Expense.expense_date <= _parse_date(args["date_to"], "date_to"))
+
+    categories = _multi_value(args, "category")
+    if len(categories) == 1:
+        query = query.filter(Expense.category == categories[0])
+    elif categories:
+        query = query.filter(Expense.category.in_(categories))
+
+    if args.get("payment_mode"):
+        query = query.filter(Expense.payment_mode == args["payment_mode"])
+
+    if args.get("merchant_name"):
+        query = query.filter(Expense.merchant_name == args["merchant_name"])
+
+    if args.get("min_amount"):
+        query = query.filter(Expense.amount >= _parse_amount(args["min_amount"], "min_amount"))
+
+    if args.get("max_amount"):
+        query = query.filter(Expense.amount <= _parse_amount(args["max_amount"], "max_amount"))
+
+    return query
+
+
+def expense_filter_key(args):
+    """
+    Canonical, order-independent form of the filter params (for cache keys)
+    """
+    key = {}
+    for name in FILTER_PARAMS:
+        values = _multi_value(args, name) if name == "category" else args.getlist(name)
+        values = sorted(v for v in values if v)
+        if values:
+            key[name] = values
+    return key
+
+
+
+# Sparse fieldsets
+
+def parse_expense_fields(value):
+    """
+    Parse ?fields=expense_date,category,amount
+
+    Returns the requested fields in EXPENSE_FIELDS order (all when absent)
+    """
+    if not value:
+        return EXPENSE_FIELDS
+
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    if not requested or not requested <= set(EXPENSE_FIELDS):
+        raise ValueError(f"fields must be a comma-separated subset of: {', '.join(EXPENSE_FIELDS)}")
+
+    return tuple(field for field in EXPENSE_FIELDS if field in requested)
+
+
+def expense_columns(fields, sort=None):
+    """
+    Columns to select for a fieldset
+
+    The requested fields come first (row order the serializer expects);
+    with a sort, the keyset cursor columns are appended when not requested
+    """
+    names = list(fields)
+    if sort is not None:
+        names += [name for name in dict.fromkeys(("expense_id", sort.key)) if name not in fields]
+    return [getattr(Expense, name) for name in names]
+
+
+
+# Sorting and keyset pagination
+
+def parse_expense_sort(value):
+    """
+    Parse ?sort=<key> or ?sort=-<key> (descending)
+    """
+    value = (value or DEFAULT_SORT).strip()
+    descending = value.startswith("-")
+    key = value.lstrip("-+")
+
+    if key not in SORT_COLUMNS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_COLUMNS)}")
+
+    return ExpenseSort(key, SORT_COLUMNS[key], descending)
+
+
+def apply_expense_sort(query, sort):
+    """
+    Order by the sort key with expense_id as the tie breaker
+    """
+    if sort.descending:
+        return query.order_by(sort.column.desc(), Expense.expense_id.desc())
+    return query.order_by(sort.column.asc(), Expense.expense_id.asc())
+
+
+def _sort_spec(sort):
+    return f"-{sort.key}" if sort.descending else sort.key
+
+
+def apply_expense_cursor(query, sort, cursor):
+    """
+    Seek past the last row of the previous page
+    """
+    values = decode_cursor(cursor)
+
+    try:
+        spec, last_value, last_id = values
+        # A cursor only continues the listing (key and direction) it came from
+        if spec != _sort_spec(sort):
+            raise ValueError
+        if sort.key == "expense_date":
+            last_value = _parse_date(last_value, "cursor")
+        else:
+            last_value = _parse_amount(last_value, "cursor")
+        last_id = int(last_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    if sort.descending:
+        return query.filter(or_(
+            sort.column < last_value,
+            and_(sort.column == last_value, Expense.expense_id < last_id)
+        ))
+
+    return query.filter(or_(
+        sort.column > last_value,
+        and_(sort.column == last_value, Expense.expense_id > last_id)
+    ))
+
+
+def expense_cursor(sort, expense):
+    """
+    Build the cursor pointing after the given expense
+    """
+    value = getattr(expense, sort.key)
+    value = value.isoformat() if sort.key == "expense_date" else str(value)
+    return encode_cursor([_sort_spec(sort), value, expense.expense_id])
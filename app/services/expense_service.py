@@ -0,0 +1,120 @@
+"""
+Expense Service
+Set-based expense writes shared by bulk endpoints and importers,
+and the bookkeeping every expense write must do
+"""
+
+import logging
+
+from sqlalchemy import delete, insert, text
+
+from app.extensions.db import db
+from app.models.category_total_model import ExpenseCategoryTotal
+from app.models.expense_model import Expense
+from app.models.rollup_model import ExpenseRollup, ExpenseRollupBucket
+from app.services.data_version_service import bump_data_version
+from app.services.rollup_service import invalidate_rollups
+from app.services.summary_service import apply_category_deltas
+
+
+# Engine URL -> whether multi-row INSERTs get consecutive ids (MySQL)
+_autoinc_consecutive = {}
+
+
+def record_expense_changes(user_id, added=(), removed=()):
+    """
+    Bookkeeping for an expense create / update / delete
+
+    added / removed: (category, amount, expense_date) of rows written / deleted
+    (an update removes the old values and adds the new ones)
+
+    Call in the same transaction as the write, before commit
+    """
+    bump_data_version(user_id)
+    apply_category_deltas(
+        user_id,
+        added=[(category, amount) for category, amount, _ in added],
+        removed=[(category, amount) for category, amount, _ in removed]
+    )
+    invalidate_rollups(user_id, [expense_date for _, _, expense_date in (*added, *removed)])
+
+
+def delete_user_bookkeeping(user_id):
+    """
+    Delete a user's category totals and rollups in the caller's
+    transaction, before the user row itself
+
+    The foreign keys cascade on MySQL / PostgreSQL, but SQLite does not
+    enforce them by default, which would leave rows for a reused user id.
+    The data version is kept (bump it instead): it must stay monotonic
+    """
+    for model in (ExpenseCategoryTotal, ExpenseRollup, ExpenseRollupBucket):
+        db.session.execute(delete(model).where(model.user_id == int(user_id)))
+
+
+def _mysql_consecutive_ids(bind):
+    """
+    True when one multi-row INSERT gets consecutive auto-increment ids:
+    innodb_autoinc_lock_mode 0 (traditional) or 1 (consecutive). Mode 2
+    (interleaved, MySQL 8's default) gives no such guarantee.
+    Read once per engine.
+    """
+    key = str(bind.url)
+    if key not in _autoinc_consecutive:
+        mode = db.session.execute(text("SELECT @@innodb_autoinc_lock_mode")).scalar()
+        _autoinc_consecutive[key] = mode is not None and int(mode) in (0, 1)
+        if not _autoinc_consecutive[key]:
+            logging.warning(
+                "innodb_autoinc_lock_mode=%s: bulk inserts that return ids fall back "
+                "to per-row INSERTs (set it to 1, or pass return_ids=false)", mode
+            )
+    return _autoinc_consecutive[key]
+
+
+def insert_expenses(rows, return_ids=True):
+    """
+    Insert many expense rows in the current transaction
+
+    rows: list of column dicts (user_id, expense_date, category, amount, ...)
+    return_ids: fetch generated expense_ids, in input order
+
+    Uses one executemany INSERT (batched into multi-row VALUES by the
+    driver / SQLAlchemy insertmanyvalues). When ids are requested:
+    - INSERT .. RETURNING where supported (PostgreSQL, SQLite)
+    - MySQL: one multi-row INSERT, ids derived from LAST_INSERT_ID() (the
+      first id) and the row count; needs innodb_autoinc_lock_mode 0 or 1,
+      otherwise ids are read back row by row
+    Caller commits.
+    """
+
+    if not rows:
+        return []
+
+    table = Expense.__table__
+
+    if not return_ids:
+        db.session.execute(insert(table), rows)
+        return None
+
+    bind = db.session.get_bind()
+    dialect = bind.dialect
+    if getattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False):
+        result = db.session.execute(
+            insert(table).returning(table.c.expense_id, sort_by_parameter_order=True),
+            rows
+        )
+        return result.scalars().all()
+
+    if dialect.name == "mysql" and _mysql_consecutive_ids(bind):
+        # Single statement: its rows get consecutive ids starting at lastrowid
+        result = db.session.execute(insert(table).values(rows))
+        if result.rowcount == len(rows):
+            first_id = result.lastrowid
+            return list(range(first_id, first_id + len(rows)))
+        raise RuntimeError(f"Bulk insert wrote {result.rowcount} of {len(rows)} rows")
+
+    # No RETURNING support: ORM flush reads lastrowid row by row
+    expenses = [Expense(**row) for row in rows]
+    db.session.add_all(expenses)
+    db.session.flush()
+    return [expense.expense_id for expense in expenses]
@@ -0,0 +1,79 @@
+"""
+Export Service
+Streams expense query results as encoded chunks (NDJSON / JSON array / CSV)
+Rows are read in server-side cursor batches so memory stays flat
+"""
+
+import csv
+import io
+
+from flask import current_app
+
+
+def iter_batches(query, batch_size):
+    """
+    Read query results from a server-side cursor in fixed-size batches
+    """
+    batch = []
+    for row in query.yield_per(batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def iter_ndjson(query, serialize, batch_size):
+    """
+    Yield one JSON document per line, one chunk per batch
+    """
+    dumps = current_app.json.dumps
+
+    for batch in iter_batches(query, batch_size):
+        yield "".join(dumps(serialize(row)) + "\n" for row in batch)
+
+
+def iter_json_array(query, serialize, batch_size, envelope):
+    """
+    Yield a JSON object whose "expenses" key is streamed element by element
+
+    envelope: leading keys of the response object (e.g. message)
+    """
+    dumps = current_app.json.dumps
+
+    head = dumps(envelope)
+    yield head[:-1] + (", " if envelope else "") + '"expenses": ['
+
+    first = True
+    for batch in iter_batches(query, batch_size):
+        chunk = ", ".join(dumps(serialize(row)) for row in batch)
+        yield chunk if first else ", " + chunk
+        first = False
+
+    yield "]}"
+
+
+def iter_csv(query, header, batch_size):
+    """
+    Yield a CSV header chunk, then one chunk of rows per batch
+
+    query must return plain row tuples in header order
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    # Header goes out before the first database round trip completes
+    writer.writerow(header)
+    yield drain()
+
+    for batch in iter_batches(query, batch_size):
+        writer.writerows(batch)
+        yield drain()
@@ -0,0 +1,169 @@
+"""
+Import Service
+Stream-parses CSV / NDJSON expense files and inserts them in chunks
+Each chunk is committed on its own so a failed import can be resumed
+"""
+
+import csv
+import json
+import logging
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions.db import db
+from app.services.expense_service import insert_expenses, record_expense_changes
+from app.utils.validators import validate_expense
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Rejected rows echoed back in the import report
+MAX_REPORTED_REJECTS = 100
+
+
+
+# Record readers: yield (index, record, parse_error) one row at a time
+
+def iter_csv_records(text_stream):
+    """
+    Read CSV rows as dicts; header names are normalized to field names
+    and blank fields read as missing (NULL)
+    """
+    reader = csv.reader(text_stream)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    fields = [name.strip().lower().replace(" ", "_") for name in header]
+
+    index = 0
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # The reader resumes on the next line
+            yield index, None, f"Invalid CSV row: {e}"
+            index += 1
+            continue
+
+        if len(row) > len(fields):
+            yield index, None, "Too many columns"
+        else:
+            yield index, {field: value if value.strip() else None for field, value in zip(fields, row)}, None
+        index += 1
+
+
+def iter_ndjson_records(text_stream):
+    """
+    Read one JSON object per line, skipping blank lines
+    """
+    index = 0
+    for line in text_stream:
+        if not line.strip():
+            continue
+        try:
+            yield index, json.loads(line), None
+        except ValueError:
+            yield index, None, "Invalid JSON"
+        index += 1
+
+
+def iter_records(text_stream, file_format):
+    if file_format == "csv":
+        return iter_csv_records(text_stream)
+    if file_format == "ndjson":
+        return iter_ndjson_records(text_stream)
+    raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+
+
+
+# Chunked import
+
+def import_expense_records(user_id, records, chunk_size, offset=0, progress=None):
+    """
+    Validate and insert streamed records for one user
+
+    records: iterable of (index, record, parse_error)
+    offset: skip records before this index (resume a previous import)
+    progress: optional callback(stats) invoked after every committed chunk
+
+    Returns a report with rows read, imported and rejected, rows/s and
+    committed_offset: the index to resume from if the import stops early
+    (an "error" key is set when a chunk failed to commit or the file could
+    not be decoded / parsed; "error_type" is "database" or "file")
+    """
+
+    stats = {
+        "rows_read": 0,
+        "imported": 0,
+        "rejected": 0,
+        "rejected_rows": [],
+        "committed_offset": offset
+    }
+    started = time.perf_counter()
+    chunk = []
+    next_offset = offset
+
+    def commit_chunk():
+        insert_expenses(chunk, return_ids=False)
+        record_expense_changes(user_id, added=[
+            (row["category"], row["amount"], row["expense_date"]) for row in chunk
+        ])
+        db.session.commit()
+        stats["imported"] += len(chunk)
+        stats["committed_offset"] = next_offset
+        chunk.clear()
+        if progress:
+            progress(stats)
+
+    try:
+        for index, record, error in records:
+            if index < offset:
+                continue
+
+            stats["rows_read"] += 1
+            next_offset = index + 1
+
+            if error is None:
+                values, error = validate_expense(record)
+
+            if error:
+                stats["rejected"] += 1
+                if len(stats["rejected_rows"]) < MAX_REPORTED_REJECTS:
+                    stats["rejected_rows"].append({"index": index, "message": error})
+                continue
+
+            values["user_id"] = user_id
+            chunk.append(values)
+
+            if len(chunk) >= chunk_size:
+                commit_chunk()
+
+        if chunk:
+            commit_chunk()
+
+        # Trailing rejected rows need no commit
+        stats["committed_offset"] = next_offset
+
+    except SQLAlchemyError as e:
+        # Earlier chunks stay committed; report where to resume from
+        db.session.rollback()
+        logging.error(f"Database error during expense import: {e}")
+        stats["error"] = "Database error"
+        stats["error_type"] = "database"
+
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Unreadable input: rows of the unfinished chunk are not inserted
+        db.session.rollback()
+        stats["error"] = f"Invalid import file: {e}"
+        stats["error_type"] = "file"
+
+    finally:
+        elapsed = time.perf_counter() - started
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["rows_per_second"] = round(stats["rows_read"] / elapsed, 1) if elapsed else 0.0
+
+    return stats
@@ -0,0 +1,90 @@
+"""
+Password Service
+Runs bcrypt hashing / verification on a bounded worker pool so a login
+storm cannot monopolize request threads; excess work is shed early
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app.extensions.bcrypt import bcrypt
+
+
+# Per-process pool; bcrypt releases the GIL while hashing
+_executor = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when BCRYPT_WORKERS + BCRYPT_MAX_PENDING operations are in flight
+    """
+
+
+def _get_pool():
+    global _executor, _slots
+
+    with _pool_lock:
+        if _executor is None:
+            workers = current_app.config["BCRYPT_WORKERS"]
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+            _slots = threading.BoundedSemaphore(workers + current_app.config["BCRYPT_MAX_PENDING"])
+        return _executor, _slots
+
+
+def _run(fn, *args):
+    """
+    Execute fn on the bcrypt pool and wait for the result
+    """
+    executor, slots = _get_pool()
+
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+
+    # Free the slot when the work finishes, even if the caller stops waiting
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+
+# Public API
+
+def hash_password(password: str) -> str:
+    """
+    bcrypt hash at the configured cost (BCRYPT_LOG_ROUNDS)
+    """
+    return _run(bcrypt.generate_password_hash, password).decode("utf-8")
+
+
+def check_password(password_hash: str, password: str) -> bool:
+    """
+    Verify a password against its stored hash
+    """
+    return _run(bcrypt.check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Whether a stored hash was made with a different cost than configured
+    """
+    try:
+        cost = int(password_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return True
+    return cost != current_app.config["BCRYPT_LOG_ROUNDS"]
+
+
+def busy_headers():
+    """
+    Retry-After header for 503 responses when the pool is saturated
+    """
+    return {"Retry-After": str(current_app.config["BCRYPT_RETRY_AFTER_SECONDS"])}
@@ -0,0 +1,83 @@
+"""
+Report Cache Service
+Content-addressed on-disk cache of rendered PDF reports
+Keyed by (user_id, filter set, data version) with size-based LRU eviction
+"""
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+from flask import current_app
+
+
+def report_cache_key(user_id, filters: dict, version: int) -> str:
+    """
+    Digest identifying one rendering of a report (also used as its ETag)
+    """
+    raw = json.dumps([str(user_id), filters, version], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_dir():
+    cache_dir = current_app.config["REPORT_CACHE_DIR"]
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def cached_report_path(key: str):
+    """
+    Path of a cached report, or None; a hit refreshes its LRU position
+    """
+    path = os.path.join(_cache_dir(), f"{key}.pdf")
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def store_report(key: str, buffer) -> str:
+    """
+    Write a rendered report into the cache and evict beyond the size limit
+    """
+    cache_dir = _cache_dir()
+    path = os.path.join(cache_dir, f"{key}.pdf")
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+    with open(tmp_path, "wb") as cache_file:
+        cache_file.write(buffer.getbuffer())
+    os.replace(tmp_path, path)
+
+    _evict(cache_dir, current_app.config["REPORT_CACHE_MAX_BYTES"], keep=path)
+    return path
+
+
+def _evict(cache_dir, max_bytes, keep):
+    """
+    Remove least recently used reports until the cache fits max_bytes
+    """
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if not entry.name.endswith(".pdf"):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError as e:
+            logging.warning(f"Report cache eviction failed for {path}: {e}")
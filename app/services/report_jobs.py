@@ -0,0 +1,221 @@
+"""
+Report Jobs Service
+Renders PDF reports off the request path in a bounded process pool
+
+Job state lives on local disk (REPORT_DIR) so any web worker on the
+host can report status and serve the finished file:
+- <job_id>.json   job metadata (owner, created_at)
+- <job_id>.pdf    finished report
+- <job_id>.error  failure message
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from flask import current_app
+
+from app.services.report_service import generate_pdf_report
+
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Per-process pool and queue accounting
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+
+
+class ReportQueueFull(Exception):
+    """
+    Raised when the report queue is at REPORT_QUEUE_MAX
+    """
+
+
+
+# Runs inside a pool worker process
+
+def render_report_job(expenses, job_dir, job_id):
+    """
+    Render the PDF to a temp file and atomically publish it
+    """
+    final_path = os.path.join(job_dir, f"{job_id}.pdf")
+    tmp_path = final_path + ".tmp"
+
+    try:
+        generate_pdf_report(expenses, output=tmp_path)
+        os.replace(tmp_path, final_path)
+    except Exception as e:
+        with open(os.path.join(job_dir, f"{job_id}.error"), "w") as error_file:
+            error_file.write(str(e))
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+
+# Pool management
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            # spawn: never fork a web worker holding DB connections / threads
+            _executor = ProcessPoolExecutor(
+                max_workers=current_app.config["REPORT_WORKERS"],
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _job_finished(job_dir, job_id, future):
+    global _pending
+
+    with _executor_lock:
+        _pending -= 1
+
+    # Cancelled when a crashed pool was replaced, or the worker process died
+    # (render errors are recorded by the worker itself)
+    if future.cancelled():
+        logging.error(f"Report job {job_id} cancelled with its report pool")
+        message = "Report job cancelled"
+    else:
+        error = future.exception()
+        if not error:
+            return
+        logging.error(f"Report job {job_id} crashed: {error}")
+        message = "Report worker crashed"
+
+    with open(os.path.join(job_dir, f"{job_id}.error"), "w") as error_file:
+        error_file.write(message)
+
+
+def report_queue_stats():
+    """
+    Queue depth metric for this web worker
+    """
+    return {
+        "workers": current_app.config["REPORT_WORKERS"],
+        "queue_depth": _pending,
+        "max_queue_depth": current_app.config["REPORT_QUEUE_MAX"]
+    }
+
+
+
+# Job API
+
+def _job_dir():
+    job_dir = current_app.config["REPORT_DIR"]
+    os.makedirs(job_dir, exist_ok=True)
+    return job_dir
+
+
+def _job_path(job_id, suffix):
+    if not _JOB_ID_PATTERN.match(job_id or ""):
+        return None
+    return os.path.join(_job_dir(), f"{job_id}{suffix}")
+
+
+def _prune_expired_jobs(job_dir):
+    """
+    Remove job files older than REPORT_JOB_TTL_SECONDS
+    """
+    cutoff = time.time() - current_app.config["REPORT_JOB_TTL_SECONDS"]
+
+    for entry in os.scandir(job_dir):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def submit_report_job(user_id, expenses):
+    """
+    Queue a PDF render and return the new job's status
+    """
+    global _pending
+
+    with _executor_lock:
+        if _pending >= current_app.config["REPORT_QUEUE_MAX"]:
+            raise ReportQueueFull()
+        _pending += 1
+
+    try:
+        job_dir = _job_dir()
+        _prune_expired_jobs(job_dir)
+
+        job_id = uuid.uuid4().hex
+        meta = {"job_id": job_id, "user_id": str(user_id), "created_at": int(time.time())}
+        with open(os.path.join(job_dir, f"{job_id}.json"), "w") as meta_file:
+            json.dump(meta, meta_file)
+
+        try:
+            future = _get_executor().submit(render_report_job, expenses, job_dir, job_id)
+        except BrokenProcessPool:
+            _reset_executor()
+            future = _get_executor().submit(render_report_job, expenses, job_dir, job_id)
+
+    except Exception:
+        with _executor_lock:
+            _pending -= 1
+        raise
+
+    future.add_done_callback(partial(_job_finished, job_dir, job_id))
+    return get_report_job(user_id, job_id)
+
+
+def get_report_job(user_id, job_id):
+    """
+    Status of a job owned by user_id, or None if not found
+    """
+    meta_path = _job_path(job_id, ".json")
+    if not meta_path or not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path) as meta_file:
+        meta = json.load(meta_file)
+
+    if meta["user_id"] != str(user_id):
+        return None
+
+    job = {"job_id": job_id, "created_at": meta["created_at"]}
+
+    error_path = _job_path(job_id, ".error")
+    if os.path.exists(_job_path(job_id, ".pdf")):
+        job["status"] = "done"
+    elif os.path.exists(error_path):
+        job["status"] = "failed"
+        with open(error_path) as error_file:
+            job["error"] = error_file.read()
+    else:
+        job["status"] = "pending"
+
+    return job
+
+
+def report_job_file(user_id, job_id):
+    """
+    Path of a finished report owned by user_id, or None
+    """
+    job = get_report_job(user_id, job_id)
+    if not job or job["status"] != "done":
+        return None
+    return _job_path(job_id, ".pdf")
@@ -4,15 +4,20 @@ Handles PDF report generation for expenses
 """
 
 import io
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 
 
-def generate_pdf_report(expenses):
+def generate_pdf_report(expenses, output=None):
     """
     Generate PDF report from expense list
+
+    output: file path or binary file object to write to
+    (default: a new in-memory buffer, returned rewound)
     """
-    buffer = io.BytesIO()
+    # reportlab is imported on first use so workers that never render a PDF don't pay for it
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO() if output is None else output
     pdf = canvas.Canvas(buffer, pagesize=A4)
 
     width, height = A4
@@ -49,5 +54,6 @@ def generate_pdf_report(expenses):
             y = height - 40
 
     pdf.save()
-    buffer.seek(0)
+    if output is None:
+        buffer.seek(0)
     return buffer
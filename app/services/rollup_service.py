@@ -0,0 +1,310 @@
+"""
+Rollup Service
+Time-bucketed (day / week / month / year) spending totals computed in SQL
+
+Closed buckets (ending before today) are materialized on first read and
+reused until an expense dated inside them is written (which bumps that
+bucket's generation); the open bucket is always computed live.
+Materialized rows are staged in the caller's session (the controller commits)
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions.db import db
+from app.models.expense_model import Expense
+from app.models.rollup_model import ExpenseRollup, ExpenseRollupBucket
+from app.utils.db_utils import increment_or_insert_many
+
+
+GRANULARITIES = ("day", "week", "month", "year")
+
+
+
+# Bucket arithmetic (weeks start on Monday)
+
+def bucket_start(value: date, granularity: str) -> date:
+    if granularity == "day":
+        return value
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    return value.replace(month=1, day=1)
+
+
+def next_bucket(start: date, granularity: str) -> date:
+    if granularity == "day":
+        return start + timedelta(days=1)
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return date(start.year + 1, 1, 1)
+
+
+def _bucket_expr(granularity, dialect):
+    """
+    SQL expression mapping expense_date to its bucket start
+    """
+    column = Expense.expense_date
+
+    if granularity == "day":
+        return column
+
+    if dialect == "mysql":
+        if granularity == "week":
+            return func.subdate(column, func.weekday(column))
+        fmt = "%Y-%m-01" if granularity == "month" else "%Y-01-01"
+        return func.date_format(column, fmt)
+
+    if dialect == "sqlite":
+        if granularity == "week":
+            return func.date(column, "-6 days", "weekday 1")
+        fmt = "%Y-%m-01" if granularity == "month" else "%Y-01-01"
+        return func.strftime(fmt, column)
+
+    if dialect == "postgresql":
+        return func.date(func.date_trunc(granularity, column))
+
+    raise ValueError(f"Rollups are not supported on {dialect}")
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+
+# SQL aggregation
+
+def compute_rollups(user_id, granularity, start, end):
+    """
+    GROUP BY bucket, category over [start, end) in SQL
+
+    Returns a list of (bucket_start, category, total, count)
+    """
+    dialect = db.session.get_bind().dialect.name
+    bucket = _bucket_expr(granularity, dialect).label("bucket")
+
+    rows = db.session.execute(
+        select(bucket, Expense.category, func.sum(Expense.amount), func.count())
+        .where(
+            Expense.user_id == user_id,
+            Expense.expense_date >= start,
+            Expense.expense_date < end
+        )
+        .group_by(bucket, Expense.category)
+    )
+
+    return [(_as_date(row[0]), row[1], row[2], row[3]) for row in rows]
+
+
+def _claim_buckets(user_id, granularity, starts, generations):
+    """
+    Mark buckets as materialized at the generation read before their totals
+    were computed; returns the bucket starts claimed (an expense write in
+    between bumped the generation of the others)
+    """
+    new = [start for start in starts if start not in generations]
+    if new:
+        db.session.execute(insert(ExpenseRollupBucket.__table__), [
+            {
+                "user_id": user_id,
+                "granularity": granularity,
+                "bucket_start": start,
+                "bucket_end": next_bucket(start, granularity),
+                "generation": 0,
+                "materialized_generation": 0
+            }
+            for start in new
+        ])
+
+    if not generations:
+        return set(new)
+
+    by_generation = {}
+    for start, generation in generations.items():
+        by_generation.setdefault(generation, []).append(start)
+
+    for generation, group in by_generation.items():
+        db.session.execute(
+            update(ExpenseRollupBucket)
+            .where(
+                ExpenseRollupBucket.user_id == user_id,
+                ExpenseRollupBucket.granularity == granularity,
+                ExpenseRollupBucket.bucket_start.in_(group),
+                ExpenseRollupBucket.generation == generation
+            )
+            .values(materialized_generation=generation)
+        )
+
+    claimed = db.session.execute(
+        select(ExpenseRollupBucket.bucket_start).where(
+            ExpenseRollupBucket.user_id == user_id,
+            ExpenseRollupBucket.granularity == granularity,
+            ExpenseRollupBucket.bucket_start.in_(list(generations)),
+            ExpenseRollupBucket.materialized_generation == ExpenseRollupBucket.generation
+        )
+    )
+    return set(new) | {_as_date(row[0]) for row in claimed}
+
+
+def _materialize(user_id, granularity, starts, generations):
+    """
+    Compute the given closed buckets (one GROUP BY over their span) and
+    stage the totals of those not written to since generations was read
+
+    generations: bucket_start -> generation of the existing bucket rows,
+    read before the totals are computed
+    """
+    wanted = set(starts)
+    rows = [
+        row for row in compute_rollups(user_id, granularity, starts[0], next_bucket(starts[-1], granularity))
+        if row[0] in wanted
+    ]
+
+    try:
+        # Savepoint: losing a race to a concurrent reader only undoes this block
+        with db.session.begin_nested():
+            claimed = _claim_buckets(user_id, granularity, starts, generations)
+
+            if claimed:
+                db.session.execute(
+                    delete(ExpenseRollup).where(
+                        ExpenseRollup.user_id == user_id,
+                        ExpenseRollup.granularity == granularity,
+                        ExpenseRollup.bucket_start.in_(claimed)
+                    )
+                )
+
+            rollups = [
+                {
+                    "user_id": user_id,
+                    "granularity": granularity,
+                    "bucket_start": start,
+                    "bucket_end": next_bucket(start, granularity),
+                    "category": category,
+                    "total": total,
+                    "count": count
+                }
+                for start, category, total, count in rows if start in claimed
+            ]
+            if rollups:
+                db.session.execute(insert(ExpenseRollup.__table__), rollups)
+
+    except IntegrityError:
+        # A concurrent request materialized the same buckets first
+        pass
+
+    return rows
+
+
+def get_rollups(user_id, granularity, date_from, date_to, max_buckets):
+    """
+    Per-bucket, per-category totals for every bucket overlapping [date_from, date_to]
+
+    Returns (bucket_starts, rows) where rows are (bucket_start, category, total, count)
+    """
+    user_id = int(user_id)
+    today = date.today()
+
+    starts = []
+    start = bucket_start(date_from, granularity)
+    while start <= date_to:
+        starts.append(start)
+        if len(starts) > max_buckets:
+            raise ValueError(f"Range spans more than {max_buckets} {granularity} buckets")
+        start = next_bucket(start, granularity)
+
+    closed = [s for s in starts if next_bucket(s, granularity) <= today]
+    open_starts = starts[len(closed):]
+
+    rows = []
+
+    if closed:
+        closed_end = next_bucket(closed[-1], granularity)
+
+        # Read before any totals are computed (see _claim_buckets)
+        materialized, generations = set(), {}
+        for row in db.session.execute(
+            select(
+                ExpenseRollupBucket.bucket_start,
+                ExpenseRollupBucket.generation,
+                ExpenseRollupBucket.materialized_generation
+            ).where(
+                ExpenseRollupBucket.user_id == user_id,
+                ExpenseRollupBucket.granularity == granularity,
+                ExpenseRollupBucket.bucket_start >= closed[0],
+                ExpenseRollupBucket.bucket_start < closed_end
+            )
+        ):
+            if row[2] == row[1]:
+                materialized.add(_as_date(row[0]))
+            else:
+                generations[_as_date(row[0])] = row[1]
+
+        stored = db.session.execute(
+            select(ExpenseRollup.bucket_start, ExpenseRollup.category, ExpenseRollup.total, ExpenseRollup.count)
+            .where(
+                ExpenseRollup.user_id == user_id,
+                ExpenseRollup.granularity == granularity,
+                ExpenseRollup.bucket_start >= closed[0],
+                ExpenseRollup.bucket_start < closed_end
+            )
+        )
+        rows.extend(
+            (_as_date(row[0]), row[1], row[2], row[3])
+            for row in stored if _as_date(row[0]) in materialized
+        )
+
+        missing = [s for s in closed if s not in materialized]
+        if missing:
+            rows.extend(_materialize(user_id, granularity, missing, generations))
+
+    if open_starts:
+        rows.extend(compute_rollups(
+            user_id, granularity, open_starts[0], next_bucket(open_starts[-1], granularity)
+        ))
+
+    return starts, rows
+
+
+
+# Invalidation (called from expense writes, in their transaction)
+
+def invalidate_rollups(user_id, dates):
+    """
+    Bump the generation of every bucket containing one of the given expense
+    dates, so their materialized totals are recomputed on the next read
+
+    Rows are upserted (created if missing) so a reader materializing one of
+    these buckets concurrently cannot store totals that miss this write
+    """
+    dates = {_as_date(value) for value in dates if value is not None}
+    if not dates:
+        return
+
+    user_id = int(user_id)
+    rows = [
+        {
+            "user_id": user_id,
+            "granularity": granularity,
+            "bucket_start": start,
+            "bucket_end": next_bucket(start, granularity)
+        }
+        for granularity in GRANULARITIES
+        # Sorted: concurrent writers lock bucket rows in the same order
+        for start in sorted({bucket_start(value, granularity) for value in dates})
+    ]
+
+    increment_or_insert_many(
+        ExpenseRollupBucket.__table__, rows,
+        keys=("user_id", "granularity", "bucket_start"),
+        deltas={"generation": 1}
+    )
@@ -0,0 +1,279 @@
+"""
+Seed Service
+Synthetic users and expenses at production scale (flask seed)
+
+Columns are generated a batch at a time with random.choices over weighted
+tables (categories, merchants per category, payment modes, dates skewed
+towards recent weekends, per-user activity), then written with one
+executemany INSERT per batch. Batches are spread over worker processes:
+on server databases each worker inserts through its own engine; SQLite
+allows one writer at a time, so workers only generate and the calling
+process inserts.
+"""
+
+import math
+import multiprocessing
+import random
+import time
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+
+from sqlalchemy import create_engine, insert, select
+
+from app.models.expense_model import Expense
+from app.models.user_model import User
+
+
+# Category -> (weight, lognormal mu, sigma of the amount, merchants)
+CATEGORY_PROFILES = {
+    "Groceries": (22, 3.4, 0.6, ["FreshMart", "Big Basket", "Reliance Fresh", "More", "Local Kirana"]),
+    "Food": (20, 2.9, 0.7, ["Swiggy", "Zomato", "Cafe Coffee Day", "Starbucks", "Domino's", "Saravana Bhavan"]),
+    "Travel": (12, 4.0, 1.0, ["Uber", "Ola", "IRCTC", "IndiGo", "Rapido", "Metro"]),
+    "Shopping": (10, 4.3, 1.1, ["Amazon", "Flipkart", "Myntra", "Decathlon", "IKEA"]),
+    "Utilities": (8, 4.5, 0.5, ["Electricity Board", "Airtel", "Jio", "Water Board", "Gas Agency"]),
+    "Entertainment": (7, 3.6, 0.8, ["Netflix", "BookMyShow", "Spotify", "PVR"]),
+    "Health": (6, 4.2, 0.9, ["Apollo Pharmacy", "MedPlus", "Clinic", "Lab Tests"]),
+    "Rent": (3, 7.5, 0.3, ["Landlord"]),
+    "Education": (4, 5.0, 0.9, ["Udemy", "Coursera", "School Fees", "Books"]),
+    "Other": (8, 3.5, 1.2, [None])
+}
+
+PAYMENT_MODES = (["UPI", "Card", "Cash", "Net Banking", "Wallet"], [45, 28, 15, 7, 5])
+LOCATIONS = ([None, "Chennai", "Bengaluru", "Mumbai", "Delhi", "Hyderabad", "Pune"], [40, 15, 15, 10, 8, 7, 5])
+DESCRIPTIONS = ([None, "Weekly", "Monthly", "One-off", "Shared"], [60, 12, 12, 10, 6])
+NOTES = ([None, "", "Reimbursable", "Split with friends", "Paid in advance"], [70, 10, 8, 7, 5])
+
+
+def _category_tables():
+    categories = list(CATEGORY_PROFILES)
+    weights = [CATEGORY_PROFILES[name][0] for name in categories]
+    return categories, weights
+
+
+def _date_tables(days, end):
+    """
+    Day offsets weighted towards recent days (growth) and weekends
+    """
+    offsets = list(range(days))
+    weights = []
+    for offset in offsets:
+        day = end - timedelta(days=offset)
+        recency = math.exp(-offset / max(days, 1))
+        weekend = 1.4 if day.weekday() >= 5 else 1.0
+        weights.append(recency * weekend)
+    return offsets, weights
+
+
+def generate_expenses(rng, count, user_ids, user_weights, days, end):
+    """
+    count expense row dicts with realistic column distributions
+    """
+    categories, category_weights = _category_tables()
+    offsets, date_weights = _date_tables(days, end)
+
+    users = rng.choices(user_ids, cum_weights=user_weights, k=count)
+    picked_categories = rng.choices(categories, weights=category_weights, k=count)
+    picked_offsets = rng.choices(offsets, weights=date_weights, k=count)
+    payment_modes = rng.choices(*PAYMENT_MODES, k=count)
+    locations = rng.choices(*LOCATIONS, k=count)
+    descriptions = rng.choices(*DESCRIPTIONS, k=count)
+    notes = rng.choices(*NOTES, k=count)
+    # Merchant popularity within a category is Zipf-like (first listed = most used)
+    merchant_ranks = rng.choices(range(6), weights=[1 / (rank + 1) for rank in range(6)], k=count)
+
+    lognormvariate = rng.lognormvariate
+    dates = [end - timedelta(days=offset) for offset in range(days)]
+
+    rows = []
+    for i in range(count):
+        _, mu, sigma, merchants = CATEGORY_PROFILES[picked_categories[i]]
+        rows.append({
+            "user_id": users[i],
+            "expense_date": dates[picked_offsets[i]],
+            "category": picked_categories[i],
+            "amount": round(min(lognormvariate(mu, sigma), 99999999.0), 2),
+            "description": descriptions[i],
+            "payment_mode": payment_modes[i],
+            "merchant_name": merchants[merchant_ranks[i] % len(merchants)],
+            "location": locations[i],
+            "notes": notes[i]
+        })
+    return rows
+
+
+
+# Parallel loading
+
+EXPENSE_COLUMNS = (
+    "user_id", "expense_date", "category", "amount", "description",
+    "payment_mode", "merchant_name", "location", "notes", "created_at"
+)
+
+# Row dict -> tuple in EXPENSE_COLUMNS order
+_expense_values = itemgetter(*EXPENSE_COLUMNS)
+
+_worker = {}
+
+
+def _is_sqlite(database_uri):
+    return database_uri.startswith("sqlite")
+
+
+def _init_worker(database_uri, user_ids, user_weights, days, end):
+    # Each process opens its own connections (never share a forked pool)
+    _worker.update(
+        engine=None if _is_sqlite(database_uri) else create_engine(database_uri),
+        user_ids=user_ids,
+        user_weights=user_weights,
+        days=days,
+        end=end
+    )
+
+
+def _generate_batch(task):
+    """
+    One batch as tuples in EXPENSE_COLUMNS order, sorted by (user, date) so
+    the composite indexes are appended to rather than split at random
+    """
+    batch_seed, count = task
+    rng = random.Random(batch_seed)
+
+    started = time.perf_counter()
+    rows = generate_expenses(rng, count, _worker["user_ids"], _worker["user_weights"], _worker["days"], _worker["end"])
+    rows.sort(key=lambda row: (row["user_id"], row["expense_date"]))
+
+    created_at = datetime.utcnow()
+    batch = []
+    for row in rows:
+        row["created_at"] = created_at
+        batch.append(_expense_values(row))
+    return batch, time.perf_counter() - started
+
+
+def _load_batch(task):
+    """
+    Generate and insert one batch (server databases); returns (rows, generate_s, insert_s)
+    """
+    batch, generate_seconds = _generate_batch(task)
+
+    started = time.perf_counter()
+    with _worker["engine"].begin() as connection:
+        connection.execute(insert(Expense.__table__), [dict(zip(EXPENSE_COLUMNS, row)) for row in batch])
+
+    return len(batch), generate_seconds, time.perf_counter() - started
+
+
+def _sqlite_writer(database_uri):
+    """
+    Single writer for SQLite (one write lock, so parallel inserts only queue):
+    driver-level executemany with durability relaxed for the bulk load
+    """
+    engine = create_engine(database_uri)
+    connection = engine.connect()
+    connection.exec_driver_sql("PRAGMA synchronous = OFF")
+    connection.exec_driver_sql("PRAGMA cache_size = -262144")
+
+    statement = (
+        f"INSERT INTO {Expense.__tablename__} ({', '.join(EXPENSE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in EXPENSE_COLUMNS)})"
+    )
+
+    def write(batch):
+        started = time.perf_counter()
+        # Same text formats SQLAlchemy's SQLite Date / DateTime types store
+        created_at = batch[0][-1].strftime("%Y-%m-%d %H:%M:%S.%f") if batch else None
+        connection.exec_driver_sql(statement, [
+            (row[0], row[1].isoformat(), *row[2:-1], created_at) for row in batch
+        ])
+        connection.commit()
+        return time.perf_counter() - started
+
+    def close():
+        connection.close()
+        engine.dispose()
+
+    return write, close
+
+
+def seed_email_filter(column, email_prefix):
+    """
+    LIKE condition for <prefix><n>@example.com; % and _ in the prefix match literally
+    """
+    escaped = email_prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return column.like(f"{escaped}%@example.com", escape="/")
+
+
+def create_seed_users(session, count, email_prefix, password_hash):
+    """
+    Insert count users sharing one password hash; returns their ids
+    """
+    table = User.__table__
+    for offset in range(0, count, 10000):
+        session.execute(insert(table), [
+            {"full_name": f"Seed User {n}", "email": f"{email_prefix}{n}@example.com", "password_hash": password_hash}
+            for n in range(offset, min(offset + 10000, count))
+        ])
+    session.commit()
+
+    return session.execute(
+        select(table.c.user_id).where(seed_email_filter(table.c.email, email_prefix)).order_by(table.c.user_id)
+    ).scalars().all()
+
+
+def seed_expenses(database_uri, user_ids, total, batch_size, workers, seed, days, progress=None):
+    """
+    Insert total expenses spread over user_ids (a few heavy users, a long
+    tail of light ones) using worker processes; returns load statistics
+    """
+    rng = random.Random(seed)
+    activity = [rng.paretovariate(1.5) for _ in user_ids]
+    user_weights = list(_cumulative(activity))
+
+    tasks = [
+        (seed * 1_000_003 + index, min(batch_size, total - offset))
+        for index, offset in enumerate(range(0, total, batch_size))
+    ]
+
+    stats = {"rows": 0, "generate_seconds": 0.0, "insert_seconds": 0.0}
+    started = time.perf_counter()
+
+    def record(rows, generate_seconds, insert_seconds):
+        stats["rows"] += rows
+        stats["generate_seconds"] += generate_seconds
+        stats["insert_seconds"] += insert_seconds
+        if progress:
+            progress(stats["rows"], time.perf_counter() - started)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(database_uri, user_ids, user_weights, days, date.today())
+    ) as pool:
+        if _is_sqlite(database_uri):
+            # Workers generate, this process writes
+            write, close = _sqlite_writer(database_uri)
+            try:
+                for batch, generate_seconds in pool.imap_unordered(_generate_batch, tasks):
+                    record(len(batch), generate_seconds, write(batch))
+            finally:
+                close()
+        else:
+            for rows, generate_seconds, insert_seconds in pool.imap_unordered(_load_batch, tasks):
+                record(rows, generate_seconds, insert_seconds)
+
+    elapsed = time.perf_counter() - started
+    stats.update({
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(stats["rows"] / elapsed) if elapsed else None,
+        "generate_seconds": round(stats["generate_seconds"], 3),
+        "insert_seconds": round(stats["insert_seconds"], 3)
+    })
+    return stats
+
+
+def _cumulative(values):
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
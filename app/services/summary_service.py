@@ -0,0 +1,140 @@
+"""
+Summary Service
+Incrementally maintained per-user category totals,
+plus rebuild / verify for repairing drift
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select
+
+from app.extensions.async_db import async_db
+from app.extensions.db import db
+from app.models.category_total_model import ExpenseCategoryTotal
+from app.models.expense_model import Expense
+from app.utils.db_utils import increment_or_insert
+
+
+def _money(value):
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+
+def apply_category_deltas(user_id, added=(), removed=()):
+    """
+    Add / subtract (category, amount) pairs from the user's totals
+
+    Runs in the caller's transaction; rows are touched in category
+    order so concurrent writers lock them in the same sequence
+    """
+    deltas = {}
+    for sign, pairs in ((1, added), (-1, removed)):
+        for category, amount in pairs:
+            total, count = deltas.get(category, (Decimal("0"), 0))
+            deltas[category] = (total + sign * Decimal(str(amount)), count + sign)
+
+    table = ExpenseCategoryTotal.__table__
+    for category in sorted(deltas):
+        total, count = deltas[category]
+        if total == 0 and count == 0:
+            continue
+        increment_or_insert(
+            table,
+            {"user_id": int(user_id), "category": category},
+            {"total": total, "count": count}
+        )
+
+
+def _category_summary_query(user_id):
+    return (
+        select(ExpenseCategoryTotal.category, ExpenseCategoryTotal.total)
+        .where(ExpenseCategoryTotal.user_id == int(user_id), ExpenseCategoryTotal.count > 0)
+        .order_by(ExpenseCategoryTotal.category)
+    )
+
+
+def get_category_summary(user_id):
+    """
+    Category totals of a user (primary key range lookup)
+    """
+    return db.session.execute(_category_summary_query(user_id)).all()
+
+
+async def get_category_summary_async(user_id):
+    """
+    get_category_summary on the async engine (ASGI mode)
+    """
+    return (await async_db.session.execute(_category_summary_query(user_id))).all()
+
+
+
+# Repair: recompute from the expenses table
+
+def _grouped_expenses(user_id=None):
+    query = select(
+        Expense.user_id,
+        Expense.category,
+        func.sum(Expense.amount),
+        func.count()
+    ).group_by(Expense.user_id, Expense.category)
+
+    if user_id is not None:
+        query = query.where(Expense.user_id == user_id)
+    return query
+
+
+def rebuild_category_totals(user_id=None):
+    """
+    Replace totals (of one user, or everyone) with a fresh GROUP BY
+    Caller commits
+    """
+    table = ExpenseCategoryTotal.__table__
+
+    clear = delete(table)
+    if user_id is not None:
+        clear = clear.where(table.c.user_id == user_id)
+    db.session.execute(clear)
+
+    db.session.execute(
+        insert(table).from_select(
+            ["user_id", "category", "total", "count"],
+            _grouped_expenses(user_id)
+        )
+    )
+
+
+def verify_category_totals(user_id=None):
+    """
+    Compare maintained totals against a fresh GROUP BY
+
+    Returns a list of drifted (user_id, category) entries
+    """
+    expected = {
+        (row[0], row[1]): (_money(row[2]), row[3])
+        for row in db.session.execute(_grouped_expenses(user_id))
+    }
+
+    query = db.session.query(
+        ExpenseCategoryTotal.user_id,
+        ExpenseCategoryTotal.category,
+        ExpenseCategoryTotal.total,
+        ExpenseCategoryTotal.count
+    ).filter(ExpenseCategoryTotal.count != 0)
+    if user_id is not None:
+        query = query.filter(ExpenseCategoryTotal.user_id == user_id)
+
+    actual = {(row[0], row[1]): (_money(row[2]), row[3]) for row in query}
+
+    drift = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        if expected.get(key) != actual.get(key):
+            exp_total, exp_count = expected.get(key, (Decimal("0"), 0))
+            act_total, act_count = actual.get(key, (Decimal("0"), 0))
+            drift.append({
+                "user_id": key[0],
+                "category": key[1],
+                "expected_total": str(exp_total),
+                "actual_total": str(act_total),
+                "expected_count": exp_count,
+                "actual_count": act_count
+            })
+    return drift
@@ -0,0 +1,220 @@
+"""
+User Cache Service
+Per-process LRU + TTL caches of user records:
+- auth records (login by email, refresh by id), validated on every hit
+  against the user's credential stamp in the shared stamp store
+  (app.extensions.user_stamps); read from the database when no shared
+  store is configured
+- profiles, keyed by user id and served only at the data version they
+  were loaded at
+
+Profile writes, password changes and account deletion replace the
+user's stamp after commit (invalidate_user) and bump the data version,
+so no entry is served after a change, in this worker or any other
+"""
+
+import logging
+import threading
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.extensions.async_db import async_db
+from app.extensions.db import db
+from app.extensions.user_stamps import user_stamps
+from app.models.user_model import User
+from app.utils.lru_cache import TTLCache
+
+
+# Immutable snapshots; duck-type the User fields their callers read
+AuthUser = namedtuple("AuthUser", ["user_id", "full_name", "email", "password_hash"])
+CachedUser = namedtuple("CachedUser", ["user_id", "full_name", "email", "created_at"])
+
+_AUTH_COLUMNS = (User.user_id, User.full_name, User.email, User.password_hash)
+_PROFILE_COLUMNS = (User.user_id, User.full_name, User.email, User.created_at)
+
+_profiles = None
+_auth_users = None
+_cache_lock = threading.Lock()
+
+
+
+# Auth path (login / refresh)
+
+def _auth_cache():
+    global _auth_users
+
+    with _cache_lock:
+        if _auth_users is None:
+            _auth_users = TTLCache(current_app.config["USER_CACHE_SIZE"], current_app.config["USER_AUTH_CACHE_TTL"])
+        return _auth_users
+
+
+def _query_auth_user(condition):
+    row = db.session.execute(select(*_AUTH_COLUMNS).where(condition)).first()
+    return AuthUser(*row) if row else None
+
+
+def _cached_auth_user(stamps, key):
+    """
+    Cached AuthUser under key while its stamp is current, else None
+    """
+    entry = _auth_cache().get(key)
+    if entry is None:
+        return None
+
+    user, stamp = entry
+    if stamps.get(user.user_id) != stamp:
+        _auth_cache().delete(key)
+        return None
+    return user
+
+
+def _load_stamped(stamps, user_id):
+    """
+    (AuthUser or None, stamp); the stamp is read before the row, so a
+    change committed after the read replaces it and retires the entry
+    """
+    stamp = stamps.current(user_id)
+    user = _query_auth_user(User.user_id == user_id)
+    if user is not None:
+        _auth_cache().set(f"id:{user_id}", (user, stamp))
+    return user, stamp
+
+
+def load_user_by_email(email):
+    """
+    AuthUser for a (normalized) email, or None
+    """
+    stamps = user_stamps.store
+    if stamps is None:
+        return _query_auth_user(User.email == email)
+
+    key = f"email:{email}"
+    user = _cached_auth_user(stamps, key)
+    if user is not None:
+        return user
+
+    # Miss: resolve the id, then load the row under its stamp
+    user_id = db.session.execute(select(User.user_id).where(User.email == email)).scalar()
+    if user_id is None:
+        return None
+
+    user, stamp = _load_stamped(stamps, user_id)
+    if user is None or user.email != email:
+        # Changed in between
+        return None
+
+    _auth_cache().set(key, (user, stamp))
+    return user
+
+
+def load_user_by_id(user_id):
+    """
+    AuthUser for an id, or None
+    """
+    user_id = int(user_id)
+    stamps = user_stamps.store
+    if stamps is None:
+        return _query_auth_user(User.user_id == user_id)
+
+    user = _cached_auth_user(stamps, f"id:{user_id}")
+    if user is not None:
+        return user
+
+    return _load_stamped(stamps, user_id)[0]
+
+
+def invalidate_user(user_id):
+    """
+    Drop a user's profile and auth entries in this worker and retire its
+    cached auth records in every other one; call after the change is
+    committed (a stamp failure is logged: the write itself stands)
+    """
+    user_id = int(user_id)
+    _cache().delete(user_id)
+
+    stamps = user_stamps.store
+    if stamps is None:
+        return
+
+    _auth_cache().delete(f"id:{user_id}")
+    try:
+        stamps.bump(user_id)
+    except Exception as e:
+        logging.error(f"Failed to replace credential stamp of user {user_id}: {e}")
+
+
+
+# Profile cache
+
+def _cache():
+    global _profiles
+
+    with _cache_lock:
+        if _profiles is None:
+            _profiles = TTLCache(current_app.config["USER_CACHE_SIZE"], current_app.config["USER_CACHE_TTL"])
+        return _profiles
+
+
+def _profile_query(user_id):
+    return select(*_PROFILE_COLUMNS).where(User.user_id == int(user_id))
+
+
+def _cached_profile(user_id, version):
+    """
+    Cache lookup shared by both engines: (user, None) on a hit, or
+    (None, remember) on a miss, remember(row) caching the loaded row
+    """
+    # One entry per user (so invalidate_user can drop it), valid at its version
+    key = int(user_id)
+    entry = _cache().get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1], None
+
+    def remember(row):
+        if row is None:
+            return None
+        user = CachedUser(*row)
+        _cache().set(key, (version, user))
+        return user
+
+    return None, remember
+
+
+def get_user_by_id(user_id, version):
+    """
+    CachedUser at the user's current data version (as read for the ETag),
+    loading it on a miss (None if not found)
+    """
+    user, remember = _cached_profile(user_id, version)
+    if remember is None:
+        return user
+
+    return remember(db.session.execute(_profile_query(user_id)).first())
+
+
+async def get_user_by_id_async(user_id, version):
+    """
+    get_user_by_id on the async engine (ASGI mode); shares the cache
+    """
+    user, remember = _cached_profile(user_id, version)
+    if remember is None:
+        return user
+
+    return remember((await async_db.session.execute(_profile_query(user_id))).first())
+
+
+def user_cache_stats():
+    """
+    Hit-rate statistics of the auth and profile caches
+    """
+    stamps = user_stamps.store
+    return {
+        "auth": {
+            "stamp_backend": type(stamps).__name__ if stamps is not None else None,
+            **_auth_cache().stats()
+        },
+        "profiles": _cache().stats()
+    }
@@ -0,0 +1,157 @@
+"""
+DB Pool Utility
+Engine / connection pool options built from configuration, and a
+QueuePool that records checkout, wait and hold times
+"""
+
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+
+def engine_options(database_uri, pool_size, max_overflow, pool_timeout, pool_recycle, pre_ping):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a database URI
+
+    SQLite gets no pool sizing (its dialect picks its own pool class)
+    """
+    options = {
+        "pool_pre_ping": pre_ping,
+        "pool_recycle": pool_recycle
+    }
+
+    if make_url(database_uri).get_backend_name() == "sqlite":
+        return options
+
+    options.update({
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout
+    })
+    return options
+
+
+def replica_binds(replica_urls, **pool_options):
+    """
+    SQLALCHEMY_BINDS entries ("replica_0", "replica_1", ...) for read replicas
+    """
+    return {
+        f"replica_{index}": {"url": url, **engine_options(url, **pool_options)}
+        for index, url in enumerate(replica_urls)
+    }
+
+
+
+# Instrumented pool
+
+class _Timer:
+    """
+    Count / total / max of a duration, thread-safe
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def stats(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3)
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording:
+    - checkout: time for pool.connect() (queue wait, new connection, pre-ping)
+    - wait: time blocked waiting for a free connection
+    - held: checkout -> checkin, via pool events
+    - timeouts: checkouts that gave up after pool_timeout
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_timer = _Timer()
+        self.wait_timer = _Timer()
+        self.held_timer = _Timer()
+        self.timeouts = 0
+        self._local = threading.local()
+
+        event.listen(self, "checkout", self._on_checkout)
+        event.listen(self, "checkin", self._on_checkin)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.checkout_timer.add(time.perf_counter() - start)
+
+    def _do_get(self):
+        # QueuePool._do_get recurses; time only the outermost call
+        if getattr(self._local, "in_get", False):
+            return super()._do_get()
+
+        self._local.in_get = True
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self._local.in_get = False
+            self.wait_timer.add(time.perf_counter() - start)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            self.held_timer.add(time.perf_counter() - started)
+
+    def stats(self):
+        return {
+            "checkout": self.checkout_timer.stats(),
+            "wait": self.wait_timer.stats(),
+            "held": self.held_timer.stats(),
+            "timeouts": self.timeouts
+        }
+
+
+def pool_status(engine):
+    """
+    In-use / idle / overflow counts of an engine's pool, plus timings
+    when the pool is instrumented
+    """
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(pool.stats())
+
+    return status
@@ -0,0 +1,86 @@
+"""
+Database Utility
+Dialect-aware helpers shared by services
+"""
+
+from sqlalchemy import insert, update
+
+from app.extensions.db import db
+
+
+def increment_or_insert(table, keys: dict, deltas: dict):
+    """
+    Atomically add deltas to a counter row, creating it if missing
+
+    keys: primary key column values
+    deltas: column -> amount added (also the initial value on insert)
+
+    Runs as a single upsert on MySQL / SQLite / PostgreSQL so concurrent
+    first writes cannot collide; other backends update, then insert.
+    """
+
+    dialect = db.session.get_bind().dialect.name
+    values = {**keys, **deltas}
+    increments = {column: table.c[column] + delta for column, delta in deltas.items()}
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table).values(**values).on_duplicate_key_update(**increments)
+        db.session.execute(stmt)
+        return
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert_insert
+        stmt = upsert_insert(table).values(**values).on_conflict_do_update(
+            index_elements=list(keys), set_=increments
+        )
+        db.session.execute(stmt)
+        return
+
+    conditions = [table.c[column] == value for column, value in keys.items()]
+    result = db.session.execute(update(table).where(*conditions).values(**increments))
+    if result.rowcount == 0:
+        db.session.execute(insert(table).values(**values))
+
+
+def increment_or_insert_many(table, rows, keys, deltas: dict):
+    """
+    increment_or_insert for many rows in one statement
+
+    rows: column dicts holding the key columns plus any insert-only columns
+    keys: primary key column names
+    deltas: column -> amount added (also the initial value on insert)
+    """
+
+    if not rows:
+        return
+
+    dialect = db.session.get_bind().dialect.name
+    values = [{**row, **deltas} for row in rows]
+    increments = {column: table.c[column] + delta for column, delta in deltas.items()}
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table).values(values).on_duplicate_key_update(**increments)
+        db.session.execute(stmt)
+        return
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert_insert
+        stmt = upsert_insert(table).values(values).on_conflict_do_update(
+            index_elements=list(keys), set_=increments
+        )
+        db.session.execute(stmt)
+        return
+
+    for row in values:
+        conditions = [table.c[column] == row[column] for column in keys]
+        result = db.session.execute(update(table).where(*conditions).values(**increments))
+        if result.rowcount == 0:
+            db.session.execute(insert(table).values(**row))
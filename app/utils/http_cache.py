@@ -0,0 +1,104 @@
+"""
+HTTP Cache Utility
+ETag helpers for conditional GET (If-None-Match / 304)
+"""
+
+import hashlib
+import json
+from datetime import date
+from functools import wraps
+
+from flask import g, request, make_response
+
+from app.extensions.compression import ETAG_CODINGS
+from app.services.data_version_service import get_data_version, get_data_version_async
+from app.utils.jwt_helper import get_current_user_id
+
+
+def etag_matches(etag: str) -> bool:
+    """
+    Whether the client's If-None-Match already holds this strong ETag,
+    as sent or with a content-coding suffix added by compression
+    """
+    if_none_match = request.if_none_match
+    return if_none_match.contains(etag) or any(
+        if_none_match.contains(f"{etag}-{coding}") for coding in ETAG_CODINGS
+    )
+
+
+def not_modified(etag: str):
+    """
+    Empty 304 response carrying the current ETag
+    """
+    response = make_response("", 304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def data_version_etag(user_id, version: int) -> str:
+    """
+    Strong ETag of the current request's representation at a data version
+
+    Covers the endpoint, its query params and the negotiated media type,
+    plus today's date for views whose defaults are relative to today (rollups)
+    """
+    raw = json.dumps([
+        str(user_id),
+        version,
+        date.today().isoformat(),
+        request.endpoint,
+        sorted(request.args.items(multi=True)),
+        request.headers.get("Accept", "")
+    ], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+# Conditional GET decorator (use under jwt_user_required)
+
+def _tag_response(response, etag: str):
+    if response.status_code == 200:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.vary.add("Accept")
+    return response
+
+
+def conditional_on_data_version(fn):
+    """
+    Answer If-None-Match from the user's data version alone (no data query),
+    otherwise run the view and tag its 200 response with the ETag
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        user_id = get_current_user_id()
+        # Views key their own caches by the same version (g.data_version)
+        g.data_version = get_data_version(user_id)
+        etag = data_version_etag(user_id, g.data_version)
+
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        return _tag_response(make_response(fn(*args, **kwargs)), etag)
+
+    return wrapper
+
+
+def async_conditional_on_data_version(fn):
+    """
+    conditional_on_data_version for async views (ASGI mode)
+    """
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        user_id = get_current_user_id()
+        g.data_version = await get_data_version_async(user_id)
+        etag = data_version_etag(user_id, g.data_version)
+
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        return _tag_response(make_response(await fn(*args, **kwargs)), etag)
+
+    return wrapper
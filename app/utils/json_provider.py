@@ -0,0 +1,108 @@
+"""
+JSON Provider Utility
+Flask JSON provider backed by orjson when it is installed, with the
+standard library as fallback
+
+Output types match Flask's default provider: dates and datetimes are
+HTTP-date strings, Decimals are strings, keys are sorted
+(app.json.sort_keys). orjson writes non-ASCII characters as UTF-8
+rather than \\u escapes.
+"""
+
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+# dumps() keyword arguments the orjson path can honour
+_ORJSON_KWARGS = {"indent", "separators", "sort_keys"}
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider with an orjson fast path and reused stdlib encoders
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encoders = {}
+
+    def _orjson_option(self, sort_keys, indent=None):
+        # Hand dates to self.default so they keep Flask's HTTP-date format
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _orjson_dumps(self, obj, option):
+        """
+        orjson bytes, or None when orjson cannot encode obj
+        (e.g. integers beyond 64 bits, non-string keys)
+        """
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize obj to a JSON string
+        """
+        if orjson is not None and set(kwargs) <= _ORJSON_KWARGS and kwargs.get("indent") in (None, 2):
+            option = self._orjson_option(kwargs.get("sort_keys", self.sort_keys), kwargs.get("indent"))
+            encoded = self._orjson_dumps(obj, option)
+            if encoded is not None:
+                return encoded.decode()
+
+        if "default" in kwargs or not set(kwargs) <= _ORJSON_KWARGS:
+            return super().dumps(obj, **kwargs)
+
+        # json.dumps() builds a new encoder per call when given options
+        sort_keys = kwargs.get("sort_keys", self.sort_keys)
+        indent = kwargs.get("indent")
+        separators = kwargs.get("separators")
+        key = (sort_keys, self.ensure_ascii, indent, separators)
+
+        encoder = self._encoders.get(key)
+        if encoder is None:
+            encoder = json.JSONEncoder(
+                default=self.default,
+                ensure_ascii=self.ensure_ascii,
+                sort_keys=sort_keys,
+                indent=indent,
+                separators=separators
+            )
+            self._encoders[key] = encoder
+        return encoder.encode(obj)
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize JSON text or UTF-8 bytes
+        """
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """
+        JSON response; the orjson path writes bytes without a str round trip
+        """
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        option = self._orjson_option(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE
+        encoded = self._orjson_dumps(obj, option)
+        if encoded is None:
+            return super().response(*args, **kwargs)
+
+        return self._app.response_class(encoded, mimetype=self.mimetype)
@@ -6,7 +6,9 @@ for Expense Tracker API (User-based only)
 
 from functools import wraps
 from datetime import timedelta
+import asyncio
 import logging
+import time
 
 from flask import jsonify
 from flask_jwt_extended import (
@@ -14,9 +16,12 @@ from flask_jwt_extended import (
     create_refresh_token,
     get_jwt,
     get_jwt_identity,
-    jwt_required
+    jwt_required,
+    verify_jwt_in_request
 )
 
+from app.extensions.revocation import revocation_store
+
 # Token expiry configuration
 
 ACCESS_EXPIRES = timedelta(minutes=30)
@@ -24,12 +29,6 @@ REFRESH_EXPIRES = timedelta(days=30)
 ID_TOKEN_EXPIRES = timedelta(minutes=60)
 
 
-# In-memory token blocklist (logout revoke)
-
-_BLOCKLIST = set()
-
-
-
 
 # Build claims to embed inside token
 
@@ -120,11 +119,11 @@ def create_access_token_for_refresh(user):
 
 # Token revocation helpers (Logout)
 
-def revoke_jti(jti: str):
+def revoke_jti(jti: str, expires_at: int):
     """
-    Store revoked token jti in blocklist
+    Store revoked token jti until its exp (unix time) in the revocation store
     """
-    _BLOCKLIST.add(jti)
+    revocation_store.revoke(jti, expires_at)
 
 
 def revoke_current_token():
@@ -136,7 +135,7 @@ def revoke_current_token():
         jti = payload.get("jti")
 
         if jti:
-            revoke_jti(jti)
+            revoke_jti(jti, payload.get("exp") or time.time() + REFRESH_EXPIRES.total_seconds())
             return True
 
     except Exception as e:
@@ -149,13 +148,31 @@ def is_token_revoked(jwt_payload):
     """
     Check whether token is revoked
     """
-    return jwt_payload.get("jti") in _BLOCKLIST
+    jti = jwt_payload.get("jti")
+    return bool(jti) and revocation_store.is_revoked(jti)
 
 
 
 
 # JWT protected route decorator (Access token only)
 
+def _access_token_error():
+    """
+    Error response when the verified token is revoked or not an access token
+    """
+    payload = get_jwt()
+
+    # Revoke check
+    if is_token_revoked(payload):
+        return jsonify({"message": "Token revoked"}), 401
+
+    # Token type validation
+    if payload.get("token_type") != "access":
+        return jsonify({"message": "Invalid token type"}), 401
+
+    return None
+
+
 def jwt_user_required(fn):
     """
     Protect routes using access token + revoke validation
@@ -165,15 +182,9 @@ def jwt_user_required(fn):
     @jwt_required()
     def wrapper(*args, **kwargs):
         try:
-            payload = get_jwt()
-
-            # Revoke check
-            if is_token_revoked(payload):
-                return jsonify({"message": "Token revoked"}), 401
-
-            # Token type validation
-            if payload.get("token_type") != "access":
-                return jsonify({"message": "Invalid token type"}), 401
+            error = _access_token_error()
+            if error is not None:
+                return error
 
             return fn(*args, **kwargs)
 
@@ -184,6 +195,30 @@ def jwt_user_required(fn):
     return wrapper
 
 
+def async_jwt_user_required(fn):
+    """
+    jwt_user_required for async views (ASGI mode)
+
+    Missing / invalid / expired tokens raise as in jwt_required and are
+    answered by the JWT error handlers
+    """
+
+    def verify():
+        verify_jwt_in_request()
+        return _access_token_error()
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        # The revocation lookup may hit the database: keep it off the event loop
+        error = await asyncio.to_thread(verify)
+        if error is not None:
+            return error
+
+        return await fn(*args, **kwargs)
+
+    return wrapper
+
+
 
 
 # Helper functions to extract user info from token
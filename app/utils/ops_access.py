@@ -0,0 +1,48 @@
+"""
+Ops Access Utility
+Restricts operational endpoints (/health/*, /metrics) to internal callers:
+a client address inside OPS_ALLOWED_NETWORKS, or a request carrying
+"Authorization: Bearer <OPS_ACCESS_TOKEN>" when a token is configured
+"""
+
+import hmac
+import ipaddress
+
+from flask import current_app, jsonify, request
+
+
+def _allowed_networks():
+    networks = current_app.extensions.get("ops_allowed_networks")
+    if networks is None:
+        networks = [
+            ipaddress.ip_network(value, strict=False)
+            for value in current_app.config["OPS_ALLOWED_NETWORKS"]
+        ]
+        current_app.extensions["ops_allowed_networks"] = networks
+    return networks
+
+
+def _has_ops_token():
+    token = current_app.config["OPS_ACCESS_TOKEN"]
+    if not token:
+        return False
+
+    scheme, _, value = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode(), token.encode())
+
+
+def _from_allowed_network():
+    try:
+        address = ipaddress.ip_address(request.remote_addr or "")
+    except ValueError:
+        return False
+    return any(address in network for network in _allowed_networks())
+
+
+def require_ops_access():
+    """
+    before_request hook for ops blueprints; None lets the request through
+    """
+    if _has_ops_token() or _from_allowed_network():
+        return None
+    return jsonify({"message": "Forbidden"}), 403
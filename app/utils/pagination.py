@@ -0,0 +1,73 @@
+"""
+Pagination Utility
+Opaque cursor encoding and limit / offset parsing
+"""
+
+import base64
+import json
+
+
+# Encode last row's sort key into an opaque cursor string
+
+def encode_cursor(values):
+    """
+    Encode a list of sort key values into a URL-safe cursor
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Decode a cursor back into its list of sort key values
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
+# Parse ?limit= with default and upper bound
+
+def parse_limit(value, default: int, maximum: int, name: str = "limit") -> int:
+    """
+    Validate page size (or other bounded count) query parameter
+    """
+    if value in (None, ""):
+        return default
+
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+    if limit < 1:
+        raise ValueError(f"{name} must be greater than 0")
+
+    return min(limit, maximum)
+
+
+# Parse a non-negative integer position (e.g. import resume offset)
+
+def parse_offset(value) -> int:
+    """
+    Validate offset query parameter
+    """
+    if value in (None, ""):
+        return 0
+
+    try:
+        offset = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("offset must be an integer")
+
+    if offset < 0:
+        raise ValueError("offset must not be negative")
+
+    return offset
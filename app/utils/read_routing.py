@@ -0,0 +1,71 @@
+"""
+Read Routing Utility
+Decorator routing read-only handlers to a read replica when it is
+caught up with the user's latest write
+"""
+
+import logging
+from functools import wraps
+
+from flask import g
+from sqlalchemy.exc import DBAPIError
+
+from app.extensions.db import db
+from app.extensions.replica_routing import replica_router, use_replica, use_primary
+from app.services.data_version_service import get_data_version
+from app.utils.jwt_helper import get_current_user_id
+
+
+def _route_to_replica(user_id, primary_version):
+    """
+    Pick the first healthy replica whose copy of the user's data version
+    has reached the primary's (read-your-writes); otherwise stay on primary
+
+    Returns the chosen replica engine, or None
+    """
+    for engine in replica_router.candidates(db.engines):
+        use_replica(engine)
+        try:
+            if get_data_version(user_id) >= primary_version:
+                return engine
+        except DBAPIError as e:
+            db.session.rollback()
+            replica_router.mark_down(engine)
+            logging.error(f"Read replica unavailable, falling back: {e}")
+
+    use_primary()
+    return None
+
+
+# Replica read decorator (use under jwt_user_required and, on ETag views,
+# under conditional_on_data_version so a 304 never touches a replica)
+
+def replica_reads(fn):
+    """
+    Serve the handler's queries from a replica when one is up to date
+
+    The primary's data version is read first (or reused from
+    g.data_version); if the replica fails while the handler runs, it is
+    marked down and the handler re-runs on the primary
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        user_id = get_current_user_id()
+        if "data_version" not in g:
+            g.data_version = get_data_version(user_id)
+
+        engine = _route_to_replica(user_id, g.data_version)
+        g.replica_error = None
+        rv = fn(*args, **kwargs)
+
+        if engine is None or g.replica_error is not engine:
+            return rv
+
+        db.session.rollback()
+        replica_router.mark_down(engine)
+        logging.error("Read replica failed during the request, re-running on the primary")
+        use_primary()
+        return fn(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,108 @@
+"""
+Serializers Utility
+Row -> dict serializers for Expense and User responses
+
+Queries select exactly the serializer's columns (EXPENSE_COLUMNS) so
+rows arrive as plain tuples; each serializer is built once per
+fieldset and zips the row with its field names in C, touching only
+the converted fields (amount) in Python, with no ORM attribute
+access per row
+"""
+
+from functools import lru_cache
+
+from app.models.expense_model import Expense
+from app.models.user_model import User
+
+
+def row_serializer(fields, converters=None):
+    """
+    Build a function turning a row tuple (in fields order) into a dict
+
+    converters: {field: callable} applied to non-null values of that field
+    """
+    fields = tuple(fields)
+    converted = tuple(
+        (index, field, converters[field])
+        for index, field in enumerate(fields)
+        if converters and field in converters
+    )
+
+    if not converted:
+        def serialize_row(row):
+            return dict(zip(fields, row))
+        return serialize_row
+
+    def serialize_row(row):
+        result = dict(zip(fields, row))
+        for index, field, convert in converted:
+            value = row[index]
+            if value is not None:
+                result[field] = convert(value)
+        return result
+
+    return serialize_row
+
+
+def row_of(obj, fields):
+    """
+    Row tuple of an ORM instance (or any object) for a row serializer
+    """
+    return tuple(getattr(obj, field) for field in fields)
+
+
+
+# Expense
+
+EXPENSE_FIELDS = (
+    "expense_id", "expense_date", "category", "amount", "description",
+    "payment_mode", "merchant_name", "location", "notes", "created_at"
+)
+
+EXPENSE_COLUMNS = tuple(getattr(Expense, field) for field in EXPENSE_FIELDS)
+
+serialize_expense_row = row_serializer(EXPENSE_FIELDS, {"amount": float})
+
+
+@lru_cache(maxsize=64)
+def expense_row_serializer(fields):
+    """
+    Serializer for a sparse fieldset (tuple in EXPENSE_FIELDS order)
+    """
+    if fields == EXPENSE_FIELDS:
+        return serialize_expense_row
+    converters = {"amount": float} if "amount" in fields else None
+    return row_serializer(fields, converters)
+
+
+def serialize_expense(expense):
+    """
+    Response dict of an Expense instance
+    """
+    return serialize_expense_row(row_of(expense, EXPENSE_FIELDS))
+
+
+# Rows rendered into PDF reports
+
+REPORT_FIELDS = ("expense_date", "category", "amount", "payment_mode")
+
+REPORT_COLUMNS = tuple(getattr(Expense, field) for field in REPORT_FIELDS)
+
+serialize_report_row = row_serializer(REPORT_FIELDS, {"amount": float})
+
+
+
+# User (public fields only, never the password hash)
+
+USER_FIELDS = ("user_id", "full_name", "email", "created_at")
+
+USER_COLUMNS = tuple(getattr(User, field) for field in USER_FIELDS)
+
+serialize_user_row = row_serializer(USER_FIELDS)
+
+
+def serialize_user(user):
+    """
+    Response dict of a User instance or cached user snapshot
+    """
+    return serialize_user_row(row_of(user, USER_FIELDS))
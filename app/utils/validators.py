@@ -1,5 +1,7 @@
 import re
 import logging
+from datetime import date
+from decimal import Decimal, InvalidOperation
 
 
 # Validates email format using regular expression
@@ -26,3 +28,52 @@ def valid_password(password: str) -> bool:
         # Logs validation failures
         logging.error(f"Password validation error: {e}")
         return False
+
+
+# Expense payload fields and their maximum lengths (None = unbounded text)
+EXPENSE_TEXT_FIELDS = {
+    "category": 100,
+    "description": 255,
+    "payment_mode": 100,
+    "merchant_name": 100,
+    "location": 100,
+    "notes": None
+}
+
+
+# Validates and normalizes one expense payload
+# Returns (expense_values, None) or (None, error_message)
+def validate_expense(data):
+    if not isinstance(data, dict):
+        return None, "Expense must be an object"
+
+    if not all(data.get(field) for field in ["expense_date", "category", "amount"]):
+        return None, "Required fields are missing"
+
+    # Accepts ISO dates (YYYY-MM-DD)
+    expense_date = data["expense_date"]
+    if not isinstance(expense_date, date):
+        try:
+            expense_date = date.fromisoformat(str(expense_date).strip())
+        except ValueError:
+            return None, "expense_date must be in YYYY-MM-DD format"
+
+    # Numeric(10, 2) column
+    try:
+        amount = Decimal(str(data["amount"])).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        return None, "amount must be a number"
+    if not amount.is_finite() or abs(amount) >= Decimal("100000000"):
+        return None, "amount is out of range"
+
+    values = {"expense_date": expense_date, "amount": amount}
+
+    for field, max_length in EXPENSE_TEXT_FIELDS.items():
+        value = data.get(field)
+        if value is not None:
+            value = str(value).strip()
+            if max_length and len(value) > max_length:
+                return None, f"{field} must be at most {max_length} characters"
+        values[field] = value
+
+    return values, None
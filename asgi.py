@@ -0,0 +1,16 @@
+"""
+ASGI Entry Point
+Expense Tracker API on an ASGI server, e.g.
+
+    uvicorn asgi:app --workers 4
+
+Expense list / summary and the user profile run as async views on an
+async SQLAlchemy engine; every other endpoint runs the WSGI app on a
+thread pool (see app/asgi.py). Requires requirements-async.txt.
+"""
+
+from run import create_app
+from app.asgi import create_asgi_app
+
+
+app = create_asgi_app(create_app())
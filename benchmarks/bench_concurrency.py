@@ -0,0 +1,295 @@
+"""
+Concurrency Benchmark
+WSGI (run.py, thread per request) vs ASGI (asgi.py, async views) serving
+the I/O-bound read endpoints at a fixed memory budget
+
+Usage:
+    pip install -r requirements-async.txt gunicorn==26.2.0
+    python benchmarks/bench_concurrency.py --budget-mb 512 --concurrency 16,64,256
+    python benchmarks/bench_concurrency.py --database-url mysql+pymysql://... --output conc.json
+
+For each mode one worker is started first and its resident memory after
+warm-up decides how many workers fit in --budget-mb; the server is then
+restarted with that many workers and driven with closed-loop clients at
+every --concurrency level against /api/expenses, /api/expenses/summary
+and /user/profile. Results (throughput, p50 / p95 / p99, errors, server
+RSS) are printed as JSON.
+
+Use a networked database (--database-url) for meaningful numbers: with
+the default local SQLite file, queries barely wait on I/O.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "Bench@123"
+EMAIL_PREFIX = "conc"
+
+MODES = {
+    "wsgi": "gunicorn --workers {workers} --threads {threads} --bind 127.0.0.1:{port} run:create_app()",
+    "asgi": "uvicorn asgi:app --workers {workers} --host 127.0.0.1 --port {port} --log-level warning"
+}
+
+PATHS = (
+    "/api/expenses?limit=50",
+    "/api/expenses?category=Food&sort=-amount&limit=50",
+    "/api/expenses/summary",
+    "/user/profile"
+)
+
+
+
+# Dataset
+
+def child_environment(args, work_dir):
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": args.database_url or f"sqlite:///{work_dir}/concurrency.db",
+        "DB_AUTO_CREATE": "false",
+        "FLASK_ENV": "production",
+        "BCRYPT_LOG_ROUNDS": "4",
+        "SQL_SLOW_QUERY_MS": "0",
+        "ASGI_WSGI_THREADS": str(args.threads)
+    })
+    return env
+
+
+def seed_dataset(args, env):
+    """
+    Schema + seeded users / expenses through the project's CLI commands
+    """
+    flask = [sys.executable, "-m", "flask", "--app", "run"]
+    subprocess.run(flask + ["db-init"], env=env, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    subprocess.run(flask + [
+        "seed", "--users", str(args.users), "--expenses", str(args.expenses),
+        "--email-prefix", EMAIL_PREFIX, "--password", PASSWORD, "--workers", "1"
+    ], env=env, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+
+# Server process
+
+def process_tree_rss_mb(pid):
+    """
+    Resident memory of a process and all its descendants (Linux /proc)
+    """
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as handle:
+                parent = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    total_kb, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, ()))
+        try:
+            with open(f"/proc/{current}/status") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return round(total_kb / 1024, 1)
+
+
+class Server:
+    def __init__(self, mode, args, env, workers):
+        command = MODES[mode].format(workers=workers, threads=args.threads, port=args.port)
+        self.process = subprocess.Popen(
+            shlex.split(command), env=env, cwd=ROOT, start_new_session=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self._wait_ready(args.port)
+
+    def _wait_ready(self, port, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with status {self.process.returncode}")
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+                connection.request("GET", "/home")
+                if connection.getresponse().status == 200:
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("Server did not become ready")
+
+    def rss_mb(self):
+        return process_tree_rss_mb(self.process.pid)
+
+    def stop(self):
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+
+
+# Load
+
+def login_tokens(port, users):
+    tokens = []
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    for n in range(users):
+        body = json.dumps({"email": f"{EMAIL_PREFIX}{n}@example.com", "password": PASSWORD})
+        connection.request("POST", "/auth/login", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        tokens.append(json.loads(response.read())["access_token"])
+    return tokens
+
+
+def drive(port, tokens, concurrency, duration):
+    """
+    Closed loop: each client sends its next request when the previous answered
+    """
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(index):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}", "Accept-Encoding": "gzip"}
+        own, failed, n = [], 0, index
+        while time.monotonic() < stop_at:
+            path = PATHS[n % len(PATHS)]
+            n += 1
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(own)
+            errors[0] += failed
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(fraction):
+        return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 2) if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99)
+    }
+
+
+def run_mode(mode, args, env, tokens_holder):
+    # One worker first: its footprint decides how many fit in the budget
+    server = Server(mode, args, env, workers=1)
+    try:
+        tokens_holder.setdefault("tokens", login_tokens(args.port, args.users))
+        drive(args.port, tokens_holder["tokens"], min(args.threads, 8), args.warmup)
+        single_rss = server.rss_mb()
+    finally:
+        server.stop()
+
+    workers = max(1, min(args.max_workers, int(args.budget_mb // single_rss)))
+
+    server = Server(mode, args, env, workers=workers)
+    try:
+        drive(args.port, tokens_holder["tokens"], min(args.threads, 8), args.warmup)
+        levels = {}
+        for concurrency in args.concurrency:
+            stats = drive(args.port, tokens_holder["tokens"], concurrency, args.duration)
+            stats["server_rss_mb"] = server.rss_mb()
+            levels[str(concurrency)] = stats
+    finally:
+        server.stop()
+
+    return {
+        "single_worker_rss_mb": single_rss,
+        "workers": workers,
+        "threads_per_worker": args.threads,
+        "levels": levels
+    }
+
+
+
+# Entry point
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Compare WSGI and ASGI throughput at a fixed memory budget")
+    parser.add_argument("--modes", default="wsgi,asgi", help="Comma-separated: wsgi, asgi")
+    parser.add_argument("--budget-mb", type=float, default=512, help="Resident memory allowed for all workers")
+    parser.add_argument("--max-workers", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=16,
+                        help="Threads per WSGI worker (and the ASGI mode's fallback pool)")
+    parser.add_argument("--concurrency", default="16,64,256", help="Comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds of warm-up load per server start")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--expenses", type=int, default=20000)
+    parser.add_argument("--database-url", help="Seed and benchmark this (empty) database instead of SQLite")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    args.concurrency = [int(value) for value in args.concurrency.split(",") if value.strip()]
+    args.modes = [value.strip() for value in args.modes.split(",") if value.strip()]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench-concurrency-") as work_dir:
+        env = child_environment(args, work_dir)
+        seed_dataset(args, env)
+
+        tokens_holder = {}
+        result = {
+            "budget_mb": args.budget_mb,
+            "users": args.users,
+            "expenses": args.expenses,
+            "paths": PATHS,
+            "modes": {mode: run_mode(mode, args, env, tokens_holder) for mode in args.modes}
+        }
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
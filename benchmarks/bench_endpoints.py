@@ -0,0 +1,417 @@
+"""
+Endpoint Benchmark
+Drives every blueprint endpoint through the Flask test client against a
+seeded local SQLite database and reports latency percentiles, throughput
+and peak RSS as JSON
+
+Usage:
+    python benchmarks/bench_endpoints.py --users 20 --expenses-per-user 2000 \
+        --iterations 50 --output bench.json
+    python benchmarks/bench_endpoints.py --baseline main.json --max-regression 0.25
+
+The dataset is generated from --seed, so two runs with the same arguments
+(on two branches) measure the same data. With --baseline the p95 of every
+endpoint is compared and the exit status is 1 on a regression.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CATEGORIES = ["Food", "Groceries", "Rent", "Travel", "Utilities", "Shopping", "Health", "Entertainment"]
+PAYMENT_MODES = ["Card", "Cash", "UPI", "Net Banking"]
+MERCHANTS = [f"Merchant {n}" for n in range(40)]
+PASSWORD = "Bench@123"
+
+# Rows per CSV import pass; report jobs are polled this often, up to the timeout
+IMPORT_ROWS = 200
+REPORT_POLL_SECONDS = 0.05
+REPORT_JOB_TIMEOUT = 120
+
+
+
+# Environment and dataset
+
+def configure_environment(args, work_dir):
+    """
+    Point the app at a throwaway SQLite database (before run.py is imported)
+    """
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{work_dir}/bench.db"
+    os.environ["FLASK_ENV"] = "production"
+    os.environ["DB_AUTO_CREATE"] = "true"
+    os.environ["BCRYPT_LOG_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ["REPORT_DIR"] = os.path.join(work_dir, "reports")
+    os.environ["REPORT_CACHE_DIR"] = os.path.join(work_dir, "report_cache")
+    os.environ.setdefault("SQL_SLOW_QUERY_MS", "0")
+    sys.path.insert(0, ROOT)
+
+
+def seed_dataset(app, args):
+    """
+    Insert args.users users with args.expenses_per_user expenses each
+    """
+    from sqlalchemy import insert
+
+    from app.extensions.db import db
+    from app.models.user_model import User
+    from app.services.expense_service import insert_expenses
+    from app.services.password_service import hash_password
+    from app.services.summary_service import rebuild_category_totals
+
+    rng = random.Random(args.seed)
+    start = date.today() - timedelta(days=730)
+
+    with app.app_context():
+        password_hash = hash_password(PASSWORD)
+        db.session.execute(insert(User.__table__), [
+            {"full_name": f"Bench User {n}", "email": f"bench{n}@example.com", "password_hash": password_hash}
+            for n in range(args.users)
+        ])
+        user_ids = [
+            user_id for (user_id,) in
+            db.session.query(User.user_id).filter(User.email.like("bench%@example.com")).order_by(User.user_id)
+        ]
+
+        for user_id in user_ids:
+            rows = [{
+                "user_id": user_id,
+                "expense_date": start + timedelta(days=rng.randrange(730)),
+                "category": rng.choice(CATEGORIES),
+                "amount": round(rng.lognormvariate(3.5, 1.0), 2),
+                "description": rng.choice([None, "Weekly", "Monthly", "One-off"]),
+                "payment_mode": rng.choice(PAYMENT_MODES),
+                "merchant_name": rng.choice(MERCHANTS),
+                "location": rng.choice([None, "Chennai", "Bengaluru", "Mumbai"]),
+                "notes": rng.choice([None, "", "Reimbursable", "Shared with team " * 4])
+            } for _ in range(args.expenses_per_user)]
+
+            for offset in range(0, len(rows), 1000):
+                insert_expenses(rows[offset:offset + 1000], return_ids=False)
+
+        rebuild_category_totals()
+        db.session.commit()
+
+    return len(user_ids)
+
+
+
+# Scenario
+
+class Recorder:
+    """
+    Latency samples and unexpected statuses per endpoint, thread-safe
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def call(self, name, method, url, expected=(200,), **kwargs):
+        start = time.perf_counter()
+        response = method(url, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        # Drain streamed bodies so their full cost is measured
+        response.get_data()
+        elapsed_total = time.perf_counter() - start if response.is_streamed else elapsed
+
+        self.record(name, elapsed_total, response.status_code in expected)
+        return response
+
+    def record(self, name, seconds, ok=True):
+        with self._lock:
+            self.samples.setdefault(name, []).append(seconds)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def import_csv(iteration):
+    """
+    CSV upload body of IMPORT_ROWS expenses
+    """
+    day = date.today().isoformat()
+    lines = ["expense_date,category,amount,payment_mode,merchant_name"]
+    lines += [f"{day},Groceries,{1 + (iteration + n) % 90}.25,UPI,Bench Import" for n in range(IMPORT_ROWS)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def run_report_job(client, recorder, auth, iteration):
+    """
+    Queue a PDF report job, poll it until it finishes and download it;
+    the queue-to-ready time is reported as expense.report_job_turnaround
+    """
+    call = recorder.call
+    started = time.perf_counter()
+
+    # A distinct (no-op) amount filter per iteration renders instead of hitting the PDF cache
+    response = call("expense.report_job_create", client.post,
+                    f"/api/expenses/export/jobs?min_amount=0.{iteration:06d}",
+                    expected=(202, 503), headers=auth)
+    if response.status_code != 202:
+        # Queue full: a valid answer under load, nothing to poll
+        return
+
+    status_url = response.get_json()["job"]["status_url"]
+    deadline = started + REPORT_JOB_TIMEOUT
+    while True:
+        job = call("expense.report_job_status", client.get, status_url, headers=auth).get_json()["job"]
+        if job["status"] != "pending" or time.perf_counter() > deadline:
+            break
+        time.sleep(REPORT_POLL_SECONDS)
+
+    recorder.record("expense.report_job_turnaround", time.perf_counter() - started, job["status"] == "done")
+    if job["status"] == "done":
+        call("expense.report_job_download", client.get, job["download_url"], headers=auth)
+
+
+def run_iteration(client, recorder, iteration, user_count):
+    """
+    One pass over every endpoint as a seeded user, plus a fresh signup
+    """
+    email = f"bench{iteration % user_count}@example.com"
+    call = recorder.call
+
+    # Auth
+    tokens = call("auth.login", client.post, "/auth/login",
+                  json={"email": email, "password": PASSWORD}).get_json()
+    auth = {"Authorization": f"Bearer {tokens['access_token']}"}
+    call("auth.refresh", client.post, "/auth/refresh",
+         headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+
+    # User profile
+    call("user.get_profile", client.get, "/user/profile", headers=auth)
+    call("user.update_profile", client.put, "/user/profile", headers=auth,
+         json={"full_name": f"Bench User {iteration}"})
+
+    # Expense CRUD
+    created = call("expense.create", client.post, "/api/expenses", expected=(201,), headers=auth, json={
+        "expense_date": date.today().isoformat(), "category": "Food", "amount": 12.5,
+        "payment_mode": "Card", "merchant_name": "Bench Cafe"
+    }).get_json()
+    expense_id = created["expense"]["expense_id"]
+
+    call("expense.bulk", client.post, "/api/expenses/bulk", expected=(201,), headers=auth, json=[
+        {"expense_date": date.today().isoformat(), "category": "Travel", "amount": 3 + n}
+        for n in range(10)
+    ])
+
+    page = call("expense.list", client.get, "/api/expenses?limit=50", headers=auth).get_json()
+    if page.get("next_cursor"):
+        call("expense.list_next_page", client.get,
+             f"/api/expenses?limit=50&cursor={page['next_cursor']}", headers=auth)
+    call("expense.list_filtered", client.get,
+         "/api/expenses?category=Food,Travel&min_amount=10&sort=-amount&limit=50", headers=auth)
+    call("expense.list_sparse", client.get,
+         "/api/expenses?fields=expense_date,category,amount&limit=200", headers=auth)
+    call("expense.list_stream", client.get, "/api/expenses?stream=true", headers=auth)
+    call("expense.list_ndjson", client.get, "/api/expenses",
+         headers={**auth, "Accept": "application/x-ndjson"})
+
+    call("expense.import_csv", client.post, "/api/expenses/import", headers=auth,
+         data=import_csv(iteration), content_type="text/csv")
+
+    call("expense.update", client.put, f"/api/expenses/{expense_id}", headers=auth, json={"amount": 13.75})
+    call("expense.delete", client.delete, f"/api/expenses/{expense_id}", headers=auth)
+
+    # Reports
+    call("expense.summary", client.get, "/api/expenses/summary", headers=auth)
+    call("expense.rollups", client.get, "/api/expenses/rollups?granularity=month&group_by=category", headers=auth)
+    call("expense.export_csv", client.get, "/api/expenses/export/csv", headers=auth)
+    # A distinct (no-op) amount filter per iteration renders instead of hitting the PDF cache
+    call("expense.export_pdf", client.get,
+         f"/api/expenses/export/pdf?min_amount=0.{iteration:06d}", headers=auth)
+    run_report_job(client, recorder, auth, iteration)
+
+    # Signup, password reset, logout and account deletion of a new user
+    new_email = f"signup{iteration}-{threading.get_ident()}@example.com"
+    call("auth.signup", client.post, "/auth/signup", expected=(201,), json={
+        "full_name": "New User", "email": new_email,
+        "password": PASSWORD, "confirm_password": PASSWORD
+    })
+
+    from app.controllers.forgot_pass_controller import reset_codes
+    call("forget.forgot_password", client.post, "/auth/forgot_password", json={"email": new_email})
+    call("forget.verify_otp", client.post, "/auth/verify_otp",
+         json={"email": new_email, "code": reset_codes.get(new_email)})
+    call("forget.reset_password", client.post, "/auth/reset_password",
+         json={"email": new_email, "new_password": "Reset@456"})
+
+    new_tokens = call("auth.login_new_user", client.post, "/auth/login",
+                      json={"email": new_email, "password": "Reset@456"}).get_json()
+    new_auth = {"Authorization": f"Bearer {new_tokens['access_token']}"}
+    call("user.delete_account", client.delete, "/user/profile", headers=new_auth)
+    call("auth.logout", client.post, "/auth/logout", headers=new_auth)
+
+    # Operational endpoints
+    call("app.home", client.get, "/home")
+    call("health.db", client.get, "/health/db")
+    call("health.reports", client.get, "/health/reports")
+    call("health.cache", client.get, "/health/cache")
+    call("metrics.prometheus", client.get, "/metrics")
+
+
+
+# Reporting
+
+def percentile(sorted_samples, fraction):
+    """
+    Nearest-rank percentile of an ascending list
+    """
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def summarize(recorder, wall_seconds):
+    endpoints = {}
+    total = 0
+
+    for name, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        total += len(ordered)
+        endpoints[name] = {
+            "requests": len(ordered),
+            "errors": recorder.errors.get(name, 0),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+            "throughput_rps": round(len(ordered) / sum(ordered), 1) if sum(ordered) else None
+        }
+
+    return endpoints, {
+        "requests": total,
+        "errors": sum(recorder.errors.values()),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(total / wall_seconds, 1) if wall_seconds else None,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def compare(result, baseline, max_regression):
+    """
+    Endpoints whose p95 grew by more than max_regression (fraction)
+    """
+    regressions = {}
+    for name, stats in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = stats["p95_ms"] / before["p95_ms"] - 1
+        if change > max_regression:
+            regressions[name] = {
+                "baseline_p95_ms": before["p95_ms"],
+                "p95_ms": stats["p95_ms"],
+                "change": round(change, 3)
+            }
+    return regressions
+
+
+
+# Entry point
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every API endpoint against a seeded dataset")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--expenses-per-user", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=20, help="scenario passes (each hits every endpoint)")
+    parser.add_argument("--concurrency", type=int, default=1, help="threads running scenario passes")
+    parser.add_argument("--warmup", type=int, default=2, help="passes run before measuring")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4,
+                        help="bcrypt cost for the run (production uses BCRYPT_LOG_ROUNDS)")
+    parser.add_argument("--database-url", help="benchmark an existing empty database instead of SQLite")
+    parser.add_argument("--output", help="write the JSON result here (default: stdout)")
+    parser.add_argument("--baseline", help="previous JSON result to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed p95 increase per endpoint, as a fraction")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix="expense-bench-")
+    configure_environment(args, work_dir)
+
+    # The app prints OTPs; keep stdout for the JSON result
+    with contextlib.redirect_stdout(sys.stderr):
+        started = time.perf_counter()
+        from run import create_app
+        app = create_app()
+        startup_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        users = seed_dataset(app, args)
+        seed_seconds = time.perf_counter() - started
+
+        client = app.test_client()
+        warmup = Recorder()
+        for iteration in range(args.warmup):
+            # Numbered past the measured passes so emails / filters stay unique
+            run_iteration(client, warmup, args.iterations + iteration, users)
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(
+                lambda iteration: run_iteration(app.test_client(), recorder, iteration, users),
+                range(args.iterations)
+            ))
+        wall_seconds = time.perf_counter() - started
+
+    endpoints, totals = summarize(recorder, wall_seconds)
+    result = {
+        "benchmark": "endpoints",
+        "config": {
+            "users": users,
+            "expenses_per_user": args.expenses_per_user,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "bcrypt_rounds": args.bcrypt_rounds,
+            "database": "sqlite" if not args.database_url else args.database_url.split(":", 1)[0],
+            "python": platform.python_version()
+        },
+        "startup_seconds": round(startup_seconds, 3),
+        "seed_seconds": round(seed_seconds, 3),
+        "totals": totals,
+        "endpoints": endpoints
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as handle:
+            result["regressions"] = compare(result, json.load(handle), args.max_regression)
+        exit_code = 1 if result["regressions"] else 0
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Startup Benchmark
+Cold-start cost of a worker: each run is a fresh interpreter that imports
+run.py, calls create_app() and serves one request through the test client
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --auto-create --runs 10 --output startup.json
+    python benchmarks/bench_startup.py --top-imports 15 --target-ms 200
+
+Reports the median / max of import, create_app, first request and the
+time from process spawn to the first response (time_to_first_request_ms).
+The exit status is 1 when the median time to first request exceeds
+--target-ms.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter; prints one JSON line
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+import run
+imported = time.perf_counter()
+app = run.create_app()
+created = time.perf_counter()
+response = app.test_client().get({path!r})
+finished = time.perf_counter()
+print(json.dumps({{
+    "status": response.status_code,
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (finished - created) * 1000,
+    "responded_at": time.time(),
+    "heavy_modules_loaded": sorted(name for name in {heavy!r} if name in sys.modules)
+}}))
+"""
+
+# Dependencies that should only load when the feature using them runs
+HEAVY_MODULES = ("reportlab", "multiprocessing.pool")
+
+
+
+# Runs
+
+def child_environment(args, work_dir):
+    env = dict(os.environ)
+    env["DATABASE_URL"] = args.database_url or f"sqlite:///{work_dir}/startup.db"
+    env["DB_AUTO_CREATE"] = "true" if args.auto_create else "false"
+    env["FLASK_ENV"] = "production"
+    return env
+
+
+def run_once(args, env):
+    probe = PROBE.format(root=ROOT, path=args.path, heavy=HEAVY_MODULES)
+    spawned = time.time()
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["time_to_first_request_ms"] = (result.pop("responded_at") - spawned) * 1000
+    return result
+
+
+def top_imports(env, count):
+    """
+    Slowest top-level imports of run.py (cumulative microseconds, -X importtime)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import run"],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        # depth 1 = imported by run.py itself, depth 2 = one level below
+        if cumulative.strip().isdigit() and depth <= 2:
+            modules.append((int(cumulative), name.strip()))
+
+    modules.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 2)} for us, name in modules[:count]]
+
+
+def summarize(runs, key):
+    values = [run[key] for run in runs]
+    return {"median": round(statistics.median(values), 2), "max": round(max(values), 2)}
+
+
+
+# Entry point
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Measure worker cold start (import, create_app, first request)")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to start")
+    parser.add_argument("--path", default="/home", help="Path of the first request")
+    parser.add_argument("--auto-create", action="store_true",
+                        help="Keep DB_AUTO_CREATE=true (create_all at boot) instead of skipping schema work")
+    parser.add_argument("--database-url", help="Database to boot against (default: throwaway SQLite)")
+    parser.add_argument("--top-imports", type=int, default=10, help="List the N slowest imports (0 = skip)")
+    parser.add_argument("--target-ms", type=float, default=200.0,
+                        help="Exit 1 when the median time to first request is above this")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as work_dir:
+        env = child_environment(args, work_dir)
+        # One untimed run warms the OS page cache and writes .pyc files
+        run_once(args, env)
+        runs = [run_once(args, env) for _ in range(args.runs)]
+        slowest_imports = top_imports(env, args.top_imports) if args.top_imports else []
+
+    ttfr = summarize(runs, "time_to_first_request_ms")
+    result = {
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "path": args.path,
+        "db_auto_create": args.auto_create,
+        "statuses": sorted({run["status"] for run in runs}),
+        "import_ms": summarize(runs, "import_ms"),
+        "create_app_ms": summarize(runs, "create_app_ms"),
+        "first_request_ms": summarize(runs, "first_request_ms"),
+        "time_to_first_request_ms": ttfr,
+        "target_ms": args.target_ms,
+        "heavy_modules_loaded": runs[-1]["heavy_modules_loaded"],
+        "slowest_imports": slowest_imports
+    }
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+
+    return 1 if ttfr["median"] > args.target_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,19 +7,29 @@ from flask import Flask
 from flask_cors import CORS
 
 from app.config import Config
+from app.cli import register_commands
 from app.extensions.db import db
 from app.extensions.bcrypt import bcrypt
 from app.extensions.jwt import jwt
+from app.extensions.revocation import revocation_store
+from app.extensions.user_stamps import user_stamps
+from app.extensions.compression import compress
+from app.extensions.metrics import request_metrics
+from app.extensions.sql_profiler import sql_profiler
+from app.extensions.replica_routing import replica_router
 
 # Import routes (blueprints)
 from app.routes.auth_routes import auth_bp
 from app.routes.forgot_pass_route import forget_bp
 from app.routes.user_routes import user_bp
 from app.routes.expense_routes import expense_bp
+from app.routes.health_routes import health_bp
+from app.routes.metrics_routes import metrics_bp
 
 
 # Import JWT revoke checker
 from app.utils.jwt_helper import is_token_revoked
+from app.utils.json_provider import FastJSONProvider
 
 
 def create_app():
@@ -30,11 +40,21 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # orjson-backed JSON encoding (stdlib fallback)
+    app.json = FastJSONProvider(app)
+
 
     # Initialize Extensions
     db.init_app(app)
+    replica_router.init_app(app)
+    sql_profiler.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
+    revocation_store.init_app(app)
+    user_stamps.init_app(app)
+    # Metrics first: its after_request runs last, so timings include compression
+    request_metrics.init_app(app)
+    compress.init_app(app)
     CORS(app, supports_credentials=True)
 
     
@@ -70,6 +90,12 @@ def create_app():
     app.register_blueprint(forget_bp)
     app.register_blueprint(user_bp)
     app.register_blueprint(expense_bp)
+    app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
+
+
+    # Register CLI Commands
+    register_commands(app)
 
 
     # Health Check Endpoint
@@ -84,9 +110,11 @@ def create_app():
         }, 200
 
 
-    # Create DB Tables (Development Only)
-    with app.app_context():
-        db.create_all()
+    # Create DB Tables (Development Only; DB_AUTO_CREATE=false skips schema work at boot)
+    if app.config["DB_AUTO_CREATE"]:
+        with app.app_context():
+            # Primary only: replicas are read-only and may be down at boot
+            db.create_all(bind_key=None)
 
     return app
 
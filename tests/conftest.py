@@ -0,0 +1,80 @@
+"""
+Test fixtures: a fresh app on a throwaway SQLite database per test
+"""
+
+import os
+import tempfile
+
+# Config is read at import time
+_WORK_DIR = tempfile.mkdtemp(prefix="expense_tracker_tests_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_WORK_DIR}/default.db")
+os.environ.setdefault("FLASK_ENV", "testing")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+os.environ.setdefault("REPORT_DIR", os.path.join(_WORK_DIR, "reports"))
+os.environ.setdefault("REPORT_CACHE_DIR", os.path.join(_WORK_DIR, "report_cache"))
+
+import pytest
+
+from app.config import Config
+from app.extensions.db import db
+from app.services import user_cache
+from run import create_app
+
+
+PASSWORD = "Test@1234"
+
+
+@pytest.fixture
+def app_factory(tmp_path, monkeypatch):
+    """
+    create_app() on this test's database; patch Config before calling it
+    """
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path}/test.db")
+    # Per-process caches outlive an app; ids restart in every test database
+    monkeypatch.setattr(user_cache, "_profiles", None)
+    monkeypatch.setattr(user_cache, "_auth_users", None)
+
+    apps = []
+
+    def factory():
+        app = create_app()
+        app.config["TESTING"] = True
+        apps.append(app)
+        return app
+
+    yield factory
+
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+@pytest.fixture
+def app(app_factory):
+    return app_factory()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def login(client, email="user@example.com", full_name="Test User"):
+    """
+    Sign up (if needed) and log in; returns the login response body
+    """
+    client.post("/auth/signup", json={
+        "full_name": full_name,
+        "email": email,
+        "password": PASSWORD,
+        "confirm_password": PASSWORD
+    })
+    response = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
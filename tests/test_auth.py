@@ -0,0 +1,84 @@
+"""
+Login, refresh and logout
+"""
+
+import pytest
+
+from app.config import Config
+from tests.conftest import PASSWORD, bearer, login
+
+
+@pytest.fixture
+def stamped_app(monkeypatch, app_factory):
+    monkeypatch.setattr(Config, "USER_STAMP_BACKEND", "memory")
+    return app_factory()
+
+
+def test_login_and_refresh_hit_the_auth_cache(stamped_app):
+    client = stamped_app.test_client()
+    body = login(client)
+    login(client)
+    assert client.post("/auth/refresh", headers=bearer(body["refresh_token"])).status_code == 200
+
+    auth = client.get("/health/cache").get_json()["users"]["auth"]
+    assert auth["stamp_backend"] == "InMemoryStampBackend"
+    assert auth["hits"] == 2
+
+
+def test_email_change_retires_cached_login(stamped_app):
+    client = stamped_app.test_client()
+    body = login(client, email="old@example.com")
+
+    client.put("/user/profile", json={"email": "new@example.com"}, headers=bearer(body["access_token"]))
+
+    old = client.post("/auth/login", json={"email": "old@example.com", "password": PASSWORD})
+    new = client.post("/auth/login", json={"email": "new@example.com", "password": PASSWORD})
+    assert old.status_code == 401
+    assert new.status_code == 200
+
+
+def test_refresh_fails_after_account_deletion(stamped_app):
+    client = stamped_app.test_client()
+    body = login(client)
+    client.post("/auth/refresh", headers=bearer(body["refresh_token"]))
+
+    client.delete("/user/profile", headers=bearer(body["access_token"]))
+
+    assert client.post("/auth/refresh", headers=bearer(body["refresh_token"])).status_code == 404
+
+
+def test_logout_revokes_the_access_token(client):
+    headers = bearer(login(client)["access_token"])
+    assert client.get("/user/profile", headers=headers).status_code == 200
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+
+    response = client.get("/user/profile", headers=headers)
+    assert response.status_code == 401
+
+
+def test_logout_reaches_other_workers_via_the_generation(app_factory, monkeypatch):
+    monkeypatch.setattr(Config, "JWT_REVOCATION_CACHE_TTL", 0)
+    worker_a = app_factory().test_client()
+    worker_b = app_factory().test_client()
+
+    headers = bearer(login(worker_a)["access_token"])
+    assert worker_a.get("/user/profile", headers=headers).status_code == 200
+
+    assert worker_b.post("/auth/logout", headers=headers).status_code == 200
+
+    assert worker_a.get("/user/profile", headers=headers).status_code == 401
+
+
+def test_not_revoked_answers_are_cached_until_a_revocation(app_factory, monkeypatch):
+    monkeypatch.setattr(Config, "JWT_REVOCATION_CACHE_TTL", 3600)
+    client = app_factory().test_client()
+    headers = bearer(login(client)["access_token"])
+
+    for _ in range(5):
+        assert client.get("/user/profile", headers=headers).status_code == 200
+
+    revocation = client.get("/health/cache").get_json()["revocation"]
+    assert revocation["not_revoked_cache"]["misses"] == 1
+    assert revocation["not_revoked_cache"]["hits"] >= 4
+    assert revocation["generation_checks"] == 1
@@ -0,0 +1,63 @@
+"""
+Expense listing: keyset pagination, filters / sorting and conditional GET
+"""
+
+import pytest
+
+from tests.conftest import bearer, login
+
+
+@pytest.fixture
+def headers(client):
+    headers = bearer(login(client)["access_token"])
+    response = client.post("/api/expenses/bulk", json=[
+        {"expense_date": f"2026-01-{day:02d}", "category": "Food" if day % 2 else "Rent", "amount": day}
+        for day in range(1, 8)
+    ], headers=headers)
+    assert response.status_code == 201
+    return headers
+
+
+def _pages(client, headers, query):
+    pages, cursor = [], None
+    while True:
+        url = f"/api/expenses?{query}" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url, headers=headers).get_json()
+        pages.append([expense["amount"] for expense in body["expenses"]])
+        cursor = body.get("next_cursor")
+        if not cursor:
+            return pages
+
+
+def test_cursor_pages_cover_every_expense_once(client, headers):
+    pages = _pages(client, headers, "limit=3")
+
+    assert pages == [[7.0, 6.0, 5.0], [4.0, 3.0, 2.0], [1.0]]
+
+
+def test_cursor_pages_follow_the_sort_and_filters(client, headers):
+    pages = _pages(client, headers, "limit=2&sort=amount&category=Food")
+
+    assert pages == [[1.0, 3.0], [5.0, 7.0]]
+
+
+def test_cursor_from_another_sort_is_rejected(client, headers):
+    cursor = client.get("/api/expenses?limit=2", headers=headers).get_json()["next_cursor"]
+
+    response = client.get(f"/api/expenses?limit=2&sort=amount&cursor={cursor}", headers=headers)
+    assert response.status_code == 400
+
+
+
+def test_unchanged_list_answers_304_and_a_write_changes_the_etag(client, headers):
+    first = client.get("/api/expenses", headers=headers)
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/expenses", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+
+    client.post("/api/expenses", json={"expense_date": "2026-02-01", "category": "Food", "amount": 1}, headers=headers)
+
+    changed = client.get("/api/expenses", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
@@ -0,0 +1,46 @@
+"""
+Streaming CSV / NDJSON import
+"""
+
+from tests.conftest import bearer, login
+
+
+HEADER = b"expense_date,category,amount,notes\n"
+
+
+def _import(client, headers, body, query="chunk_size=2"):
+    return client.post(
+        f"/api/expenses/import?{query}",
+        data=body,
+        headers={**headers, "Content-Type": "text/csv"}
+    )
+
+
+def test_import_reports_rejected_rows_and_stores_blank_fields_as_null(client):
+    headers = bearer(login(client)["access_token"])
+    body = HEADER + b"2026-01-01,Food,10,\n2026-01-02,,5,x\n2026-01-03,Rent,7,note\n"
+
+    response = _import(client, headers, body)
+    stats = response.get_json()["import"]
+
+    assert response.status_code == 200
+    assert (stats["imported"], stats["rejected"], stats["committed_offset"]) == (2, 1, 3)
+    assert stats["rejected_rows"][0]["index"] == 1
+
+    expenses = client.get("/api/expenses?sort=amount", headers=headers).get_json()["expenses"]
+    assert [expense["notes"] for expense in expenses] == ["note", None]
+
+
+def test_undecodable_input_mid_stream_reports_where_to_resume(client):
+    headers = bearer(login(client)["access_token"])
+    # Past the text decoder's first read, so some chunks commit first
+    rows = b"2026-01-05,Food,1,\n" * 2000
+    body = HEADER + rows + b"2026-01-06,Food,2,\xff\xfe\n"
+
+    response = _import(client, headers, body, "chunk_size=100")
+    stats = response.get_json()["import"]
+
+    assert response.status_code == 400
+    assert stats["error_type"] == "file"
+    assert 0 < stats["committed_offset"] <= 2000
+    assert stats["imported"] == stats["committed_offset"]
@@ -0,0 +1,31 @@
+"""
+Read-replica routing
+"""
+
+from app.config import Config
+from app.utils.db_pool import replica_binds
+from tests.conftest import bearer, login
+
+
+def test_unreachable_replica_at_boot_falls_back_to_primary(app_factory, monkeypatch, tmp_path):
+    missing = tmp_path / "no-such-dir" / "replica.db"
+    monkeypatch.setattr(Config, "SQLALCHEMY_BINDS", replica_binds(
+        [f"sqlite:///{missing}"],
+        pool_size=1, max_overflow=0, pool_timeout=1, pool_recycle=1800, pre_ping=False
+    ))
+
+    app = app_factory()
+    client = app.test_client()
+    headers = bearer(login(client)["access_token"])
+
+    created = client.post(
+        "/api/expenses",
+        json={"expense_date": "2026-01-15", "category": "Food", "amount": 12.5},
+        headers=headers
+    )
+    assert created.status_code == 201
+
+    listing = client.get("/api/expenses", headers=headers)
+    assert listing.status_code == 200
+    assert [expense["amount"] for expense in listing.get_json()["expenses"]] == [12.5]
+    assert not missing.exists()
@@ -0,0 +1,42 @@
+"""
+User profile reads, updates and account deletion
+"""
+
+from tests.conftest import bearer, login
+
+
+def test_profile_is_gone_after_update_then_delete(client):
+    headers = bearer(login(client)["access_token"])
+
+    first = client.get("/user/profile", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    assert client.put("/user/profile", json={"full_name": "Renamed"}, headers=headers).status_code == 200
+    assert client.delete("/user/profile", headers=headers).status_code == 200
+
+    assert client.get("/user/profile", headers=headers).status_code == 404
+    assert client.get("/user/profile", headers={**headers, "If-None-Match": etag}).status_code == 404
+
+
+def test_profile_update_changes_etag_and_body(client):
+    headers = bearer(login(client)["access_token"])
+
+    before = client.get("/user/profile", headers=headers)
+    client.put("/user/profile", json={"full_name": "Renamed"}, headers=headers)
+    after = client.get("/user/profile", headers={**headers, "If-None-Match": before.headers["ETag"]})
+
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.get_json()["user"]["full_name"] == "Renamed"
+
+
+def test_delete_drops_cached_profile(client):
+    body = login(client)
+    headers = bearer(body["access_token"])
+
+    client.get("/user/profile", headers=headers)
+    assert client.get("/health/cache").get_json()["users"]["profiles"]["size"] == 1
+
+    client.delete("/user/profile", headers=headers)
+    assert client.get("/health/cache").get_json()["users"]["profiles"]["size"] == 0